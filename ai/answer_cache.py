@@ -0,0 +1,119 @@
+"""
+Semantic cache of chatbot answers for repeated and near-duplicate questions
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+import numpy as np
+
+def normalize_question(question: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    question = re.sub(r"[^\w\s]", " ", question.lower())
+    return " ".join(question.split())
+
+class AnswerCache:
+    """LRU/TTL cache of answers keyed on the normalized question
+
+    Exact matches are served from a dict. Near-duplicates are found by
+    cosine similarity between question embeddings when `embed_query` is
+    given and `similarity_threshold` is below 1. Every entry belongs to a
+    knowledge-base version, and a lookup with a new version empties the
+    cache, so answers never outlive the index they were built from.
+    """
+
+    def __init__(self, embed_query: Optional[Callable[[str], List[float]]] = None,
+                 max_entries: int = 256, ttl: float = 3600,
+                 similarity_threshold: float = 0.93):
+        self.embed_query = embed_query
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _embed(self, question: str) -> Optional[np.ndarray]:
+        """Unit-length embedding of a question, if semantic lookup is enabled"""
+        if self.embed_query is None or self.similarity_threshold >= 1:
+            return None
+        vector = np.asarray(self.embed_query(question), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _sync_version(self, version: str):
+        """Drop every entry built against another knowledge-base version"""
+        if version != self.version:
+            self._entries.clear()
+            self.version = version
+
+    def lookup(self, question: str, version: str) -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """Return `(answer, embedding)`; answer is None on a miss
+
+        The embedding computed for the lookup is returned so `store` can
+        reuse it.
+        """
+        key = normalize_question(question)
+        now = time.time()
+        with self._lock:
+            self._sync_version(version)
+            for stale_key in [k for k, e in self._entries.items() if now - e["stored_at"] >= self.ttl]:
+                del self._entries[stale_key]
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry["answer"], entry["vector"]
+
+        vector = self._embed(question)
+        if vector is None:
+            with self._lock:
+                self.misses += 1
+            return None, None
+
+        with self._lock:
+            candidates = [
+                (k, e) for k, e in self._entries.items()
+                if e["vector"] is not None and e["version"] == version
+            ]
+            if candidates:
+                matrix = np.stack([e["vector"] for _, e in candidates])
+                scores = matrix @ vector
+                best = int(np.argmax(scores))
+                if scores[best] >= self.similarity_threshold:
+                    best_key, best_entry = candidates[best]
+                    self._entries.move_to_end(best_key)
+                    self.hits += 1
+                    return best_entry["answer"], vector
+            self.misses += 1
+        return None, vector
+
+    def store(self, question: str, answer: str, version: str,
+              vector: Optional[np.ndarray] = None):
+        """Remember the answer to a question for the given knowledge-base version"""
+        key = normalize_question(question)
+        with self._lock:
+            self._sync_version(version)
+            self._entries[key] = {
+                "answer": answer,
+                "vector": vector,
+                "version": version,
+                "stored_at": time.time()
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Invalidate every cached answer"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters, for diagnostics"""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,96 @@
+"""
+Offline knowledge-base build
+
+Fetches repositories and READMEs, parses the resume, chunks and embeds
+everything, and writes a self-describing artifact directory:
+
+    vectors.npy        float32 embedding matrix (memory-mapped at load)
+    chunks.json        chunk ids, texts and metadata
+    kb_manifest.json   index settings, sources and chunk ids
+    kb_artifact.json   build info and the repository list, written last
+
+Point `KB_ARTIFACT_PATH` at the directory and the app serves it read-only,
+with no GitHub or embedding work at startup. Re-running the build on an
+existing artifact only re-embeds what changed.
+
+Usage:
+    python -m ai.build_index --output kb_artifact
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+# Allow `python ai/build_index.py` as well as `python -m ai.build_index`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from ai import manifest as kb_manifest
+
+# Repository fields kept in the artifact for the query router
+REPO_FIELDS = (
+    "name", "description", "language", "stargazers_count", "forks_count",
+    "topics", "created_at", "updated_at", "pushed_at", "html_url"
+)
+
+def build_artifact(output: str, skip_github: bool = False) -> dict:
+    """Build (or incrementally update) the artifact in `output` and return its info"""
+    from ai.rag_engine import RAGEngine
+    from utils.github_api import create_github_api
+    from utils.rate_limiter import PRIORITY_BACKGROUND
+
+    started = time.time()
+    # Until the new info is written the directory is not a complete artifact
+    info_path = os.path.join(output, kb_manifest.ARTIFACT_FILENAME)
+    if os.path.exists(info_path):
+        os.remove(info_path)
+
+    repos, github = [], None
+    if not skip_github:
+        print("📚 Loading GitHub repositories...")
+        github = create_github_api(priority=PRIORITY_BACKGROUND)
+        repos = github.fetch_repositories()
+        print(f"📖 Found {len(repos)} repositories")
+
+    engine = RAGEngine(with_llm=False)
+    engine.persist_directory = output
+    engine.vector_backend = "numpy"
+    summary = engine.refresh_knowledge_base(repos, github_api=github)
+
+    manifest = kb_manifest.load_manifest(output)
+    info = {
+        "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "kb_version": engine.kb_version,
+        "embedding_model": engine.EMBEDDING_MODEL,
+        "dimension": engine.embeddings.dimension,
+        "chunks": len(manifest["chunks"]),
+        "sources": len(manifest["sources"]),
+        "github_user": config.GITHUB_USERNAME,
+        "repos": [{field: repo[field] for field in REPO_FIELDS if field in repo} for repo in repos],
+    }
+    kb_manifest.save_artifact_info(output, info)
+
+    print(
+        f"✅ Built knowledge-base artifact in {output} in {time.time() - started:.1f}s: "
+        f"{info['chunks']} chunks, {summary['embedded']} embedded, {summary['deleted']} removed"
+    )
+    return info
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the chatbot knowledge base offline")
+    parser.add_argument("--output", default=config.KB_ARTIFACT_PATH or "kb_artifact",
+                        help="artifact directory (default: KB_ARTIFACT_PATH or ./kb_artifact)")
+    parser.add_argument("--skip-github", action="store_true",
+                        help="index only the personal info and resume")
+    args = parser.parse_args()
+
+    try:
+        build_artifact(args.output, skip_github=args.skip_github)
+    except Exception as e:
+        print(f"❌ Knowledge-base build failed: {e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
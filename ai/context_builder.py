@@ -0,0 +1,98 @@
+"""
+Token-budgeted context assembly for retrieved chunks
+"""
+import re
+from typing import List
+from langchain_core.documents import Document
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text)"""
+    return (len(text) + 3) // 4
+
+def compact_text(text: str) -> str:
+    """Strip per-line indentation and collapse runs of blank lines"""
+    lines = [line.strip() for line in text.strip().splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines))
+
+def merge_chunks(docs: List[Document]) -> List[str]:
+    """Stitch chunks of one source back together where their spans overlap
+
+    The text splitter repeats up to `chunk_overlap` characters between
+    consecutive chunks and records each chunk's `start_index`, so chunks
+    are ordered by position and merged on the shared span. Chunks without
+    a position are kept unless another chunk already contains them.
+    """
+    positioned = sorted(
+        (doc.metadata["start_index"], doc.page_content)
+        for doc in docs if doc.metadata.get("start_index") is not None
+    )
+    spans = []
+    for start, text in positioned:
+        if spans and start <= spans[-1][0] + len(spans[-1][1]):
+            previous_start, previous = spans[-1]
+            end = previous_start + len(previous)
+            if start + len(text) > end:
+                spans[-1] = (previous_start, previous + text[end - start:])
+        else:
+            spans.append((start, text))
+
+    texts = [text for _, text in spans]
+    for doc in docs:
+        if doc.metadata.get("start_index") is None \
+                and not any(doc.page_content in text for text in texts):
+            texts.append(doc.page_content)
+    return texts
+
+def build_context(docs: List[Document], max_tokens: int) -> str:
+    """Assemble retrieved chunks into a prompt context of at most `max_tokens`
+
+    Chunks are grouped by source in retrieval order, overlapping chunks of
+    a source are merged, whitespace is compacted and lines repeated within
+    a source are dropped. Lines are never deduplicated across sources: two
+    repositories may share "Language: Python" and each needs it. Sources
+    are then packed best-first until the budget runs out; the last one is
+    truncated to fit, and a source left with no text gets no header.
+    """
+    groups = {}
+    for doc in docs:
+        key = (doc.metadata.get('type', 'unknown'), doc.metadata.get('name'))
+        groups.setdefault(key, []).append(doc)
+
+    parts = []
+    remaining = max_tokens
+    for (source_type, name), group in groups.items():
+        label = f"{source_type}: {name}" if name else source_type
+        header = f"[Source {len(parts) + 1} - {label}]:"
+        budget = remaining - estimate_tokens(header) - 2
+        if budget <= 0:
+            break
+
+        lines = []
+        seen_lines = set()
+        exhausted = False
+        text = "\n".join(compact_text(chunk) for chunk in merge_chunks(group))
+        for line in text.splitlines():
+            key = line.strip().lower()
+            if key and key in seen_lines:
+                continue
+            cost = estimate_tokens(line) + 1
+            if cost > budget:
+                if budget > 16:
+                    # Keep the start of an oversized line rather than dropping it
+                    lines.append(line[:budget * 4].rsplit(" ", 1)[0] + " ...")
+                exhausted = True
+                break
+            if key:
+                seen_lines.add(key)
+            lines.append(line)
+            budget -= cost
+
+        body = compact_text("\n".join(lines))
+        if body:
+            # The header is only paid for when the source contributes text
+            parts.append(f"{header}\n{body}")
+            remaining = budget
+        if exhausted:
+            break
+
+    return "\n\n---\n\n".join(parts)
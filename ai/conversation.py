@@ -0,0 +1,179 @@
+"""
+Bounded conversation memory: recent turns verbatim plus a rolling summary
+"""
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Questions that only make sense after an earlier turn:
+# - leading anaphora ("and the backend?", "what about Java?", "those in Python?")
+# - a bare "why?" / "tell me more"
+# - a personal pronoun standing in for a noun ("what does it do?")
+# - a demonstrative with no noun after it ("tell me more about that")
+FOLLOW_UP_RE = re.compile(
+    r"^(and|but|so|what about|how about|it|its|it's|that|those|these|they|them)\b"
+    r"|^(why|how so|how come|more|tell me more|more details)\W*$"
+    r"|\b(it|its|it's|they|them|their|theirs)\b"
+    r"|\b(that|this|those|these|that one|the other one)\W*$",
+    re.IGNORECASE
+)
+
+Turn = Tuple[str, str]
+
+def _clip(text: str, max_chars: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= max_chars else text[:max_chars].rsplit(" ", 1)[0] + " ..."
+
+def is_follow_up(question: str) -> bool:
+    """Whether a question probably depends on earlier turns to be understood"""
+    return bool(FOLLOW_UP_RE.search(question.strip()))
+
+def format_turns(turns: List[Turn], max_chars: int = 600) -> str:
+    """Turns as `Visitor:` / `Assistant:` lines, answers clipped to `max_chars`"""
+    return "\n".join(
+        f"Visitor: {_clip(question, max_chars)}\nAssistant: {_clip(answer, max_chars)}"
+        for question, answer in turns
+    )
+
+def fallback_summary(summary: str, turns: List[Turn], max_chars: int) -> str:
+    """Extractive summary used when no LLM summarizer is available or it fails"""
+    lines = [summary] if summary else []
+    lines.extend(f"The visitor asked: {_clip(question, 160)}" for question, _ in turns)
+    text = "\n".join(lines)
+    # Keep the most recent part; older context matters least
+    return text if len(text) <= max_chars else "..." + text[-max_chars:]
+
+class ConversationMemory:
+    """Memory of one conversation with a constant-size prompt footprint
+
+    The last `max_turns` turns are kept verbatim. Older turns move to a
+    pending list and are folded into `summary`, capped at `summary_chars`,
+    by `fold()`, which the engine runs in the background after answering.
+    Until a pending turn is folded, only its question is shown.
+    """
+
+    def __init__(self, max_turns: int = 4, summary_chars: int = 1200, turn_chars: int = 600):
+        self.max_turns = max_turns
+        self.summary_chars = summary_chars
+        self.turn_chars = turn_chars
+        self.summary = ""
+        self.turns = deque()
+        self.updated_at = time.time()
+        self._pending: List[Turn] = []
+        self._folding = False
+        self._fold_claimed = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_messages(cls, messages: List[Dict], **kwargs) -> "ConversationMemory":
+        """Memory from `{'role', 'content'}` chat messages; turns beyond `max_turns` are dropped"""
+        memory = cls(**kwargs)
+        question = None
+        for message in messages or []:
+            if message.get("role") == "user":
+                question = message.get("content", "")
+            elif question is not None:
+                memory.turns.append((question, message.get("content", "")))
+                question = None
+        while len(memory.turns) > memory.max_turns:
+            memory.turns.popleft()
+        return memory
+
+    def __bool__(self):
+        return bool(self.turns or self.summary)
+
+    def add_turn(self, question: str, answer: str):
+        with self._lock:
+            self.turns.append((question, answer))
+            while len(self.turns) > self.max_turns:
+                self._pending.append(self.turns.popleft())
+            self.updated_at = time.time()
+
+    def last_question(self) -> Optional[str]:
+        with self._lock:
+            return self.turns[-1][0] if self.turns else None
+
+    def claim_fold(self) -> bool:
+        """Whether the caller should schedule a fold
+
+        At most one fold per conversation is scheduled or running; turns
+        pending meanwhile are picked up by the next turn's fold.
+        """
+        with self._lock:
+            if not self._pending or self._fold_claimed:
+                return False
+            self._fold_claimed = True
+            return True
+
+    def render(self) -> str:
+        """The conversation so far, for the prompt"""
+        with self._lock:
+            parts = []
+            if self.summary:
+                parts.append(f"Summary of earlier conversation: {self.summary}")
+            if self._pending:
+                questions = "; ".join(_clip(question, 120) for question, _ in self._pending)
+                parts.append(f"Earlier questions: {questions}")
+            if self.turns:
+                parts.append(format_turns(list(self.turns), self.turn_chars))
+            return "\n".join(parts)
+
+    def fold(self, summarize: Optional[Callable[[str, List[Turn]], str]] = None):
+        """Fold pending turns into the summary with `summarize(summary, turns)`
+
+        Turns added while a fold runs are picked up by the next one; a
+        failing summarizer falls back to an extractive summary.
+        """
+        with self._lock:
+            if self._folding or not self._pending:
+                self._fold_claimed = False
+                return
+            self._folding = True
+            summary, turns = self.summary, list(self._pending)
+        try:
+            try:
+                folded = summarize(summary, turns).strip() if summarize else ""
+            except Exception as e:
+                print(f"⚠️ Conversation summary failed: {e}")
+                folded = ""
+            folded = _clip(folded, self.summary_chars) if folded \
+                else fallback_summary(summary, turns, self.summary_chars)
+            with self._lock:
+                self.summary = folded
+                del self._pending[:len(turns)]
+        finally:
+            with self._lock:
+                self._folding = False
+                self._fold_claimed = False
+
+class ConversationStore:
+    """Conversation memories by session id, bounded by count (LRU) and idle time"""
+
+    def __init__(self, max_sessions: int = 500, ttl: float = 3600, **memory_settings):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.memory_settings = memory_settings
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> ConversationMemory:
+        """The session's memory, created on first use"""
+        now = time.time()
+        with self._lock:
+            memory = self._sessions.get(session_id)
+            if memory is None or now - memory.updated_at > self.ttl:
+                memory = ConversationMemory(**self.memory_settings)
+                self._sessions[session_id] = memory
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            return memory
+
+    def reset(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self):
+        return len(self._sessions)
@@ -0,0 +1,119 @@
+"""
+Embedding service with batching, a query cache and request coalescing
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import List
+import numpy as np
+from langchain_core.embeddings import Embeddings
+import config
+
+class EmbeddingService(Embeddings):
+    """Sentence-transformers model behind the LangChain `Embeddings` interface
+
+    - Documents are encoded in batches of `batch_size`.
+    - Vectors are unit-length float32, so cosine similarity is a dot product.
+    - Query embeddings are kept in an LRU cache.
+    - Concurrent cache misses from simultaneous chat requests are coalesced
+      into a single forward pass: the first caller waits `coalesce_window`
+      seconds for others to join, then encodes the whole batch.
+    """
+
+    def __init__(self, model_name: str, batch_size: int = 64, cache_size: int = 1024,
+                 coalesce_window: float = 0.005, device: str = "cpu"):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.coalesce_window = coalesce_window
+        
+        # Deferred: importing sentence-transformers loads torch
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name, device=device)
+        self.dimension = self.model.get_sentence_embedding_dimension()
+
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._leader_active = False
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts into an `(n, dim)` float32 matrix of unit vectors"""
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        return np.ascontiguousarray(vectors, dtype=np.float32)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """LangChain interface: embed documents in batches"""
+        return self.encode(list(texts)).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """LangChain interface: embed a single query"""
+        return self.embed_query_array(text).tolist()
+
+    def embed_query_array(self, text: str) -> np.ndarray:
+        """Embed a query as a read-only float32 vector, using the cache"""
+        with self._cache_lock:
+            vector = self._cache.get(text)
+            if vector is not None:
+                self._cache.move_to_end(text)
+                return vector
+
+        vector = self._embed_coalesced(text)
+        vector.setflags(write=False)
+
+        with self._cache_lock:
+            self._cache[text] = vector
+            self._cache.move_to_end(text)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return vector
+
+    def _embed_coalesced(self, text: str) -> np.ndarray:
+        """Join (or lead) a batch of concurrent query embeddings"""
+        future = Future()
+        with self._pending_lock:
+            self._pending.append((text, future))
+            leader = not self._leader_active
+            self._leader_active = True
+
+        if leader:
+            # Give simultaneous requests a moment to join this forward pass
+            time.sleep(self.coalesce_window)
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+                self._leader_active = False
+
+            unique = list(dict.fromkeys(t for t, _ in batch))
+            try:
+                vectors = dict(zip(unique, self.encode(unique)))
+                for t, f in batch:
+                    f.set_result(vectors[t])
+            except Exception as e:
+                for _, f in batch:
+                    f.set_exception(e)
+
+        return future.result()
+
+    def cache_info(self) -> dict:
+        """Query cache occupancy, for diagnostics"""
+        with self._cache_lock:
+            return {"entries": len(self._cache), "max_entries": self.cache_size}
+
+def create_embedding_service(model_name: str) -> EmbeddingService:
+    """Embedding service configured from `config`"""
+    return EmbeddingService(
+        model_name,
+        batch_size=config.EMBEDDING_BATCH_SIZE,
+        cache_size=config.QUERY_EMBEDDING_CACHE_SIZE,
+        coalesce_window=config.EMBEDDING_COALESCE_MS / 1000
+    )
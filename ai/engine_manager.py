@@ -0,0 +1,193 @@
+"""
+Process-wide RAG engine, built in a background thread with readiness reporting
+"""
+import threading
+import time
+import traceback
+from typing import Dict, Optional
+import config
+from ai.query_router import QueryRouter
+
+# Build stages and the progress shown while each one runs
+STAGES = {
+    "pending": (0.0, "Waiting to start..."),
+    "loading_model": (0.1, "Loading language and embedding models..."),
+    "fetching_repos": (0.4, "Loading GitHub repositories..."),
+    "indexing": (0.6, "Building the knowledge base..."),
+    "ready": (1.0, "Chatbot is ready"),
+    "failed": (0.0, "Chatbot failed to initialize"),
+}
+
+class EngineManager:
+    """Owns the one RAGEngine of this process
+
+    The engine (embedding model, LLM clients and index) is built once in a
+    daemon thread, so page renders and API startup never wait for it.
+    Until it is ready, `status()` reports the current stage and
+    structured questions are still answered by the query router from
+    config and repository data. `engine` becomes available as soon as the
+    first batch of documents is searchable, before indexing finishes.
+    """
+
+    def __init__(self, use_groq: bool = True):
+        self.use_groq = use_groq
+        self.router = QueryRouter()
+        self.stage = "pending"
+        self.error = None
+        self.started_at = None
+        self.ready_at = None
+        self._engine = None
+        self.chunks_indexed = 0
+        self._thread = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._finished = threading.Event()
+
+    @property
+    def engine(self):
+        """The engine once it can answer questions, or None while it is still being built"""
+        return self._engine
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def start(self, retry: bool = False) -> bool:
+        """Start building the engine (idempotent); `retry` restarts after a failure"""
+        with self._lock:
+            if self._thread is not None and (self._thread.is_alive() or self._ready.is_set()):
+                return False
+            if self.stage == "failed" and not retry:
+                return False
+            self.stage = "pending"
+            self.error = None
+            self.chunks_indexed = 0
+            self.started_at = time.time()
+            self._finished.clear()
+            self._thread = threading.Thread(target=self._build, name="rag-engine-init", daemon=True)
+            self._thread.start()
+            return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the build finishes; returns whether the engine is ready"""
+        self._finished.wait(timeout)
+        return self._ready.is_set()
+
+    def _build(self):
+        try:
+            self.stage = "loading_model"
+            print("🚀 Initializing RAG Engine...")
+            from ai.rag_engine import RAGEngine
+            engine = RAGEngine(use_groq=self.use_groq, router=self.router)
+
+            # A pre-built artifact needs no GitHub or embedding work
+            if not (config.KB_ARTIFACT_PATH and engine.load_artifact(config.KB_ARTIFACT_PATH)):
+                self._build_index(engine)
+
+            self._engine = engine
+            self.stage = "ready"
+            self.ready_at = time.time()
+            self._ready.set()
+            print(f"✅ RAG Engine ready in {self.ready_at - self.started_at:.1f}s")
+        except Exception as e:
+            self.stage = "failed"
+            self._engine = None
+            self.error = f"{type(e).__name__}: {e}"
+            print(f"❌ Error initializing RAG engine: {e}")
+            traceback.print_exc()
+        finally:
+            self._finished.set()
+
+    def _build_index(self, engine):
+        """Fetch repositories and build (or warm-start) the engine's index"""
+        self.stage = "fetching_repos"
+        repos, github = self._load_repositories()
+
+        self.stage = "indexing"
+        engine.on_batch_indexed = lambda chunks: self._on_batch_indexed(engine, chunks)
+        if repos:
+            print(f"📖 Indexing {len(repos)} repositories...")
+            engine.initialize_knowledge_base(repos, github_api=github)
+        else:
+            print("⚠️ No repositories found, initializing with personal info only...")
+            engine.initialize_knowledge_base()
+
+    def _on_batch_indexed(self, engine, chunks):
+        """Serve the partially built index as soon as its first batch is searchable"""
+        self.chunks_indexed = chunks
+        if self._engine is None:
+            self._engine = engine
+            print(f"⚡ First {chunks} chunks searchable, answering while indexing continues")
+    
+    def _load_repositories(self):
+        """Repositories for the knowledge base; an empty list if GitHub is unavailable"""
+        from utils.github_api import create_github_api
+        from utils.rate_limiter import PRIORITY_BACKGROUND
+        try:
+            github = create_github_api(priority=PRIORITY_BACKGROUND)
+            repos = github.get_repositories()
+        except Exception as e:
+            print(f"⚠️ GitHub loading failed: {e}")
+            return [], None
+        if repos:
+            # Repository questions can be answered before the index is built
+            self.router.update_repos(repos)
+        return repos, github
+
+    def refresh_index(self, repos, github):
+        """Background refresher callback: re-index repositories that changed"""
+        engine = self.engine
+        if self.is_ready and repos:
+            summary = engine.refresh_knowledge_base(repos, github_api=github)
+            print(f"🔄 Knowledge base refreshed: {summary['embedded']} chunks embedded, {summary['deleted']} removed")
+
+    def route(self, question: str) -> Optional[str]:
+        """Answer a structured question without the engine, if possible"""
+        routed = self.router.route(question)
+        return routed[1] if routed else None
+
+    def reset_conversation(self, session_id: str):
+        """Forget a session's conversation memory"""
+        engine = self.engine
+        if engine is not None:
+            engine.conversations.reset(session_id)
+
+    def not_ready_message(self) -> str:
+        """What to tell a visitor whose question needs the full engine"""
+        if self.stage == "failed":
+            return "Sorry, the AI assistant is unavailable right now. Please try again later."
+        return "I'm still loading my knowledge base. Please try again in a few seconds."
+
+    def get_response(self, question, chat_history=None, session_id=None):
+        """Answer with the engine, or with the router while the engine is loading"""
+        engine = self.engine
+        if engine is not None:
+            return engine.get_response(question, chat_history, session_id=session_id)
+        return self.route(question) or self.not_ready_message()
+
+    def status(self) -> Dict:
+        """Readiness and progress, for the UI and the status endpoint"""
+        progress, message = STAGES[self.stage]
+        if self.stage == "indexing" and self.chunks_indexed:
+            message = f"Building the knowledge base ({self.chunks_indexed} chunks searchable)..."
+        end = self.ready_at or time.time()
+        return {
+            "ready": self.is_ready,
+            "searchable": self._engine is not None,
+            "stage": self.stage,
+            "progress": progress,
+            "message": message,
+            "error": self.error,
+            "elapsed": round(end - self.started_at, 1) if self.started_at else None
+        }
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_engine_manager() -> EngineManager:
+    """The process-wide engine manager (created on first use, not started)"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = EngineManager(use_groq=True)
+        return _manager
@@ -0,0 +1,132 @@
+"""
+Keyword (BM25) index and rank fusion for hybrid retrieval
+"""
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Set
+from langchain_core.documents import Document
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-_.][a-z0-9]+)*")
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; compound names also yield their parts
+
+    "agentic-qa-app" becomes ["agentic-qa-app", "agentic", "qa", "app"], so
+    exact repository names match strongly and partial mentions still match.
+    """
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        parts = re.split(r"[-_.]", token)
+        if len(parts) > 1:
+            tokens.extend(part for part in parts if part)
+    return tokens
+
+def document_key(doc: Document) -> tuple:
+    """Identity of a chunk across retrievers"""
+    return (doc.metadata.get("type"), doc.metadata.get("name"), doc.page_content)
+
+class BM25Index:
+    """In-memory inverted index with Okapi BM25 scoring
+
+    Chunks are added and removed by id, so the index follows the vector
+    store incrementally. The repository name from the chunk metadata is
+    indexed along with its text, so README chunks that never mention the
+    repository by name still match it.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._documents: Dict[str, Document] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._documents)
+
+    def ids(self) -> Set[str]:
+        """Ids of the indexed chunks"""
+        with self._lock:
+            return set(self._documents)
+
+    def clear(self):
+        """Remove every chunk"""
+        with self._lock:
+            self._postings.clear()
+            self._lengths.clear()
+            self._documents.clear()
+            self._total_length = 0
+
+    def add(self, ids: Sequence[str], documents: Sequence[Document]):
+        """Index chunks under the given ids, replacing any with the same id"""
+        with self._lock:
+            for chunk_id, doc in zip(ids, documents):
+                if chunk_id in self._documents:
+                    self._remove(chunk_id)
+                terms = Counter(tokenize(f"{doc.metadata.get('name') or ''} {doc.page_content}"))
+                for term, tf in terms.items():
+                    self._postings.setdefault(term, {})[chunk_id] = tf
+                length = sum(terms.values())
+                self._lengths[chunk_id] = length
+                self._documents[chunk_id] = doc
+                self._total_length += length
+
+    def remove(self, ids: Sequence[str]):
+        """Drop chunks by id; unknown ids are ignored"""
+        with self._lock:
+            for chunk_id in ids:
+                if chunk_id in self._documents:
+                    self._remove(chunk_id)
+
+    def _remove(self, chunk_id: str):
+        doc = self._documents.pop(chunk_id)
+        for term in set(tokenize(f"{doc.metadata.get('name') or ''} {doc.page_content}")):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(chunk_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(chunk_id)
+
+    def search(self, query: str, k: int = 5, filter: Optional[Dict] = None) -> List[Document]:
+        """Top-k chunks by BM25 score; `filter` matches metadata by equality"""
+        with self._lock:
+            n = len(self._documents)
+            if not n:
+                return []
+            avg_length = self._total_length / n
+            scores = {}
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for chunk_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[chunk_id] / avg_length)
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+            if filter:
+                scores = {
+                    chunk_id: score for chunk_id, score in scores.items()
+                    if all(self._documents[chunk_id].metadata.get(key) == value for key, value in filter.items())
+                }
+            top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [self._documents[chunk_id] for chunk_id, _ in top]
+
+def reciprocal_rank_fusion(rankings: List[List[Document]], k: int = 5,
+                           rrf_k: int = 60) -> List[Document]:
+    """Merge ranked lists with RRF: score = sum of 1 / (rrf_k + rank)"""
+    scores, documents = {}, {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, start=1):
+            key = document_key(doc)
+            documents.setdefault(key, doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+    top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+    return [documents[key] for key, _ in top]
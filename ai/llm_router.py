@@ -0,0 +1,358 @@
+"""
+Multi-provider LLM pool with failover, hedging and latency tracking
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional
+import numpy as np
+import config
+
+class LLMUnavailable(RuntimeError):
+    """Raised when every provider failed or is cooling down"""
+
+# Rate-limit exception classes of the provider SDKs (groq/openai, google-api-core),
+# matched by name so neither SDK has to be importable
+RATE_LIMIT_ERRORS = ("RateLimitError", "ResourceExhausted", "TooManyRequests")
+
+# Runs sync provider calls so `LLMRouter.invoke` can stop waiting after its timeout;
+# sized for the chat concurrency plus calls left running after a timeout
+_sync_calls = ThreadPoolExecutor(max_workers=2 * config.CHAT_MAX_CONCURRENCY, thread_name_prefix="llm")
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Whether an LLM client error is an HTTP 429 / rate limit"""
+    if any(cls.__name__ in RATE_LIMIT_ERRORS for cls in type(error).__mro__):
+        return True
+    for status in (getattr(error, "status_code", None),
+                   getattr(getattr(error, "response", None), "status_code", None),
+                   getattr(error, "code", None)):
+        if status == 429:
+            return True
+    return False
+
+async def _aclose(stream):
+    """Close a provider stream so its HTTP response is released"""
+    aclose = getattr(stream, "aclose", None)
+    if aclose is None:
+        return
+    try:
+        await aclose()
+    except Exception as e:
+        print(f"⚠️ Could not close LLM stream: {e}")
+
+class LatencyTracker:
+    """Rolling window of call latencies and outcomes"""
+
+    def __init__(self, window: int = 100):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, ok: bool = True):
+        with self._lock:
+            self._samples.append((seconds, ok))
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency percentile of successful calls, or None without samples"""
+        with self._lock:
+            latencies = [seconds for seconds, ok in self._samples if ok]
+        return float(np.percentile(latencies, q)) if latencies else None
+
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self._samples:
+                return 0.0
+            return sum(1 for _, ok in self._samples if not ok) / len(self._samples)
+
+    def __len__(self):
+        return len(self._samples)
+
+class LLMProvider:
+    """One model behind a runnable (e.g. `prompt | chat_model`)
+
+    Anything with `invoke`, `ainvoke` and `astream` works, so tests can
+    use local stub runnables instead of real providers.
+    """
+
+    def __init__(self, name: str, runnable, model=None, window: int = 100):
+        self.name = name
+        self.runnable = runnable
+        self.model = model
+        self.latency = LatencyTracker(window)
+        self.first_token = LatencyTracker(window)
+        self.cooldown_until = 0.0
+
+    def available(self) -> bool:
+        return time.time() >= self.cooldown_until
+
+    def stats(self) -> Dict:
+        return {
+            "name": self.name,
+            "calls": len(self.latency),
+            "p50": self.latency.percentile(50),
+            "p95": self.latency.percentile(95),
+            "first_token_p95": self.first_token.percentile(95),
+            "error_rate": round(self.latency.error_rate(), 3),
+            "cooling_down": not self.available()
+        }
+
+class LLMRouter:
+    """Drop-in replacement for a chain that spreads calls over providers
+
+    - Providers are tried in configured order. Providers that returned 429
+      sit out `cooldown` seconds.
+    - A timeout, 429 or other error fails over to the next provider.
+      Streams fail over only until their first token has been sent.
+    - With `hedge` enabled, `ainvoke` sends a second request to the next
+      provider once the first has run longer than its rolling p95. The
+      first answer wins and the other request is cancelled. `astream`
+      hedges the same way on the first-token p95: the first stream to
+      produce a token is used and the other one is closed.
+    """
+
+    def __init__(self, providers: List[LLMProvider], timeout: float = 30,
+                 cooldown: float = 30, hedge: bool = False,
+                 hedge_delay: float = 2.0, hedge_min_samples: int = 20):
+        if not providers:
+            raise ValueError("No LLM providers configured")
+        self.providers = providers
+        self.timeout = timeout
+        self.cooldown = cooldown
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.hedge_min_samples = hedge_min_samples
+
+    def _candidates(self) -> List[LLMProvider]:
+        """Available providers in order; all of them if every one is cooling down"""
+        available = [provider for provider in self.providers if provider.available()]
+        return available or list(self.providers)
+
+    def _record_failure(self, provider: LLMProvider, started: float, error: Exception):
+        provider.latency.record(time.perf_counter() - started, ok=False)
+        if is_rate_limit_error(error):
+            provider.cooldown_until = time.time() + self.cooldown
+        print(f"⚠️ LLM provider {provider.name} failed: {type(error).__name__}: {error}")
+
+    def _hedge_after(self, tracker: LatencyTracker) -> float:
+        """Seconds to wait for a provider before sending a hedged request"""
+        if len(tracker) >= self.hedge_min_samples:
+            p95 = tracker.percentile(95)
+            if p95 is not None:
+                return min(p95, self.timeout)
+        return min(self.hedge_delay, self.timeout)
+
+    def invoke(self, inputs):
+        """Call providers in turn until one answers
+
+        The timeout runs from when a worker starts the call, so time spent
+        waiting for a free worker does not count against a provider. A
+        provider that has not answered in time is failed over; its call
+        ends on its own once the client timeout (at most the router
+        timeout, see `create_llm_router`) expires.
+        """
+        errors = []
+        for provider in self._candidates():
+            started = {}
+            call_started = threading.Event()
+
+            def call(provider=provider):
+                started["at"] = time.perf_counter()
+                call_started.set()
+                return provider.runnable.invoke(inputs)
+
+            future = _sync_calls.submit(call)
+            call_started.wait()
+            try:
+                result = future.result(timeout=max(0.0, started["at"] + self.timeout - time.perf_counter()))
+            except FutureTimeoutError:
+                error = TimeoutError(f"no answer within {self.timeout}s")
+                self._record_failure(provider, started["at"], error)
+                errors.append(f"{provider.name}: {error}")
+                continue
+            except Exception as e:
+                self._record_failure(provider, started["at"], e)
+                errors.append(f"{provider.name}: {e}")
+                continue
+            provider.latency.record(time.perf_counter() - started["at"])
+            return result
+        raise LLMUnavailable("; ".join(errors) or "No LLM provider available")
+
+    async def _acall(self, provider: LLMProvider, inputs):
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(provider.runnable.ainvoke(inputs), self.timeout)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            error = TimeoutError(f"no answer within {self.timeout}s")
+            self._record_failure(provider, started, error)
+            raise error
+        except Exception as e:
+            self._record_failure(provider, started, e)
+            raise
+        provider.latency.record(time.perf_counter() - started)
+        return result
+
+    async def ainvoke(self, inputs):
+        """Call providers with failover and optional hedging"""
+        queue = self._candidates()
+        pending = {}
+        errors = []
+        hedged = False
+
+        def launch():
+            provider = queue.pop(0)
+            pending[asyncio.ensure_future(self._acall(provider, inputs))] = provider
+            return provider
+
+        current = launch()
+        try:
+            while pending:
+                wait = None
+                if self.hedge and not hedged and queue and len(pending) == 1:
+                    wait = self._hedge_after(current.latency)
+                done, _ = await asyncio.wait(
+                    pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    hedged = True
+                    current = launch()
+                    continue
+
+                for task in done:
+                    provider = pending.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    errors.append(f"{provider.name}: {task.exception()}")
+                if not pending and queue:
+                    current = launch()
+        finally:
+            for task in pending:
+                task.cancel()
+        raise LLMUnavailable("; ".join(errors) or "No LLM provider available")
+
+    async def astream(self, inputs):
+        """Stream from the first provider that produces a first token in time"""
+        queue = self._candidates()
+        pending = {}
+        errors = []
+        hedged = False
+        winner = None
+
+        def launch():
+            provider = queue.pop(0)
+            stream = provider.runnable.astream(inputs).__aiter__()
+            task = asyncio.ensure_future(asyncio.wait_for(stream.__anext__(), self.timeout))
+            pending[task] = (provider, stream, time.perf_counter())
+            return provider
+
+        current = launch()
+        try:
+            while pending and winner is None:
+                wait = None
+                if self.hedge and not hedged and queue and len(pending) == 1:
+                    wait = self._hedge_after(current.first_token)
+                done, _ = await asyncio.wait(
+                    pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    hedged = True
+                    current = launch()
+                    continue
+
+                for task in done:
+                    provider, stream, started = pending.pop(task)
+                    error = task.exception()
+                    if winner is None and (error is None or isinstance(error, StopAsyncIteration)):
+                        winner = (provider, stream, started, None if error else task.result())
+                        continue
+                    await _aclose(stream)
+                    if winner is not None:
+                        continue
+                    if isinstance(error, asyncio.TimeoutError):
+                        error = TimeoutError(f"no first token within {self.timeout}s")
+                    self._record_failure(provider, started, error)
+                    errors.append(f"{provider.name}: {error}")
+                if winner is None and not pending and queue:
+                    current = launch()
+        finally:
+            # Losing hedged streams (and every stream, if the consumer left early)
+            for task, (_, stream, _) in pending.items():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                await _aclose(stream)
+
+        if winner is None:
+            raise LLMUnavailable("; ".join(errors) or "No LLM provider available")
+
+        provider, stream, started, first = winner
+        if first is None:
+            # The provider finished without producing anything
+            provider.latency.record(time.perf_counter() - started)
+            return
+        provider.first_token.record(time.perf_counter() - started)
+        try:
+            yield first
+            async for chunk in stream:
+                yield chunk
+        finally:
+            # Also runs when the consumer stops early, e.g. a client disconnect
+            await _aclose(stream)
+        provider.latency.record(time.perf_counter() - started)
+
+    def stats(self) -> List[Dict]:
+        """Per-provider latency and error statistics, for diagnostics"""
+        return [provider.stats() for provider in self.providers]
+
+def create_chat_model(provider: str, model: str, timeout: Optional[float] = None):
+    """LangChain chat model for a `provider:model` entry, with a client timeout of `timeout` seconds"""
+    timeout = timeout or config.LLM_TIMEOUT
+    if provider == "groq":
+        from langchain_groq import ChatGroq
+        return ChatGroq(
+            groq_api_key=config.GROQ_API_KEY,
+            model_name=model,
+            temperature=0.7,
+            timeout=timeout,
+            max_retries=config.LLM_MAX_RETRIES
+        )
+    if provider == "gemini":
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        return ChatGoogleGenerativeAI(
+            google_api_key=config.GOOGLE_API_KEY,
+            model=model,
+            temperature=0.7,
+            timeout=timeout,
+            max_retries=config.LLM_MAX_RETRIES
+        )
+    raise ValueError(f"Unknown LLM provider: {provider}")
+
+def configured_models(use_groq: bool = True) -> List[tuple]:
+    """`(provider, model)` pairs from `config.LLM_MODELS`, limited to providers with an API key"""
+    keys = {"groq": config.GROQ_API_KEY if use_groq else None, "gemini": config.GOOGLE_API_KEY}
+    models = []
+    for entry in config.LLM_MODELS.split(","):
+        provider, _, model = entry.strip().partition(":")
+        if model and keys.get(provider):
+            models.append((provider, model))
+    return models
+
+def create_llm_router(prompt, models: List[tuple], timeout: Optional[float] = None) -> LLMRouter:
+    """Router over `prompt | model` for each `(provider, model)` pair, configured from `config`
+
+    Each model's client timeout is the router timeout, so a call the router
+    gave up on does not keep a worker busy much longer.
+    """
+    timeout = timeout or config.LLM_TIMEOUT
+    providers = []
+    for provider, model in models:
+        chat_model = create_chat_model(provider, model, timeout)
+        providers.append(LLMProvider(f"{provider}:{model}", prompt | chat_model, chat_model))
+    return LLMRouter(
+        providers,
+        timeout=timeout,
+        cooldown=config.LLM_COOLDOWN,
+        hedge=config.LLM_HEDGE,
+        hedge_delay=config.LLM_HEDGE_DELAY
+    )
@@ -0,0 +1,104 @@
+"""
+Content-addressed manifest for the persisted knowledge base
+"""
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+MANIFEST_FILENAME = "kb_manifest.json"
+MANIFEST_VERSION = 1
+ARTIFACT_FILENAME = "kb_artifact.json"
+ARTIFACT_VERSION = 1
+
+def hash_text(text: str) -> str:
+    """Return the SHA-256 hex digest of a string"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def source_key(metadata: Dict) -> str:
+    """Stable identifier of the source document a chunk was split from"""
+    doc_type = metadata.get("type", "unknown")
+    name = metadata.get("name")
+    return f"{doc_type}:{name}" if name else doc_type
+
+def hash_document(doc) -> str:
+    """Hash a document's content together with its metadata"""
+    metadata = json.dumps(doc.metadata, sort_keys=True, default=str)
+    return hash_text(f"{metadata}\n{doc.page_content}")
+
+def chunk_ids(chunks, seen: Optional[Dict] = None) -> List[str]:
+    """Content-addressed ids for split chunks
+
+    The id only depends on the chunk's source and content, so an unchanged
+    chunk keeps its id across rebuilds. Identical chunks within one source
+    are told apart by their occurrence count; pass the same `seen` dict
+    when ids are computed batch by batch.
+    """
+    ids = []
+    seen = {} if seen is None else seen
+    for chunk in chunks:
+        key = source_key(chunk.metadata)
+        digest = hash_document(chunk)
+        occurrence = seen.get((key, digest), 0)
+        seen[(key, digest)] = occurrence + 1
+        ids.append(hash_text(f"{key}\n{digest}\n{occurrence}"))
+    return ids
+
+def new_manifest(settings: Dict, repos: Optional[Dict] = None) -> Dict:
+    """Empty manifest for a vector store built with `settings`
+
+    `sources` and `chunks` are filled in as documents are indexed. `repos`
+    maps repository names to the fingerprint they were indexed at, which
+    lets a refresh skip repositories that have not changed.
+    """
+    return {
+        "version": MANIFEST_VERSION,
+        "settings": settings,
+        "repos": repos or {},
+        "sources": {},
+        "chunks": {},
+    }
+
+def manifest_digest(manifest: Dict) -> str:
+    """Version id of the indexed content: changes whenever any chunk does"""
+    payload = json.dumps([manifest.get("settings"), sorted(manifest.get("chunks", {}))])
+    return hash_text(payload)
+
+def is_compatible(manifest: Optional[Dict], settings: Dict) -> bool:
+    """Check whether vectors described by a manifest can be reused as-is"""
+    return bool(manifest) and manifest.get("version") == MANIFEST_VERSION \
+        and manifest.get("settings") == settings
+
+def _load_json(path: str) -> Optional[Dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _save_json(path: str, data: Dict):
+    """Write JSON atomically via a temporary file"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def load_manifest(directory: str) -> Optional[Dict]:
+    """Load the manifest stored next to the vector store, if any"""
+    return _load_json(os.path.join(directory, MANIFEST_FILENAME))
+
+def save_manifest(directory: str, manifest: Dict):
+    """Atomically write the manifest next to the vector store"""
+    _save_json(os.path.join(directory, MANIFEST_FILENAME), manifest)
+
+def load_artifact_info(directory: str) -> Optional[Dict]:
+    """Load the description of a pre-built knowledge-base artifact, if any"""
+    info = _load_json(os.path.join(directory, ARTIFACT_FILENAME))
+    if not info or info.get("format_version") != ARTIFACT_VERSION:
+        return None
+    return info
+
+def save_artifact_info(directory: str, info: Dict):
+    """Write the artifact description; it is saved last and marks the build complete"""
+    _save_json(os.path.join(directory, ARTIFACT_FILENAME), dict(info, format_version=ARTIFACT_VERSION))
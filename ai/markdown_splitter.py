@@ -0,0 +1,199 @@
+"""
+Markdown-aware splitting for README and Markdown documents
+"""
+import re
+from typing import List, Optional, Tuple
+from langchain_core.documents import Document
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+FENCE_RE = re.compile(r"^\s*(```|~~~)\s*([\w+-]*)")
+# Badges and images, including linked badges like [![CI](badge.svg)](actions)
+IMAGE_RE = re.compile(r"\[!\[[^\]]*\]\([^)]*\)\]\([^)]*\)|!\[[^\]]*\]\([^)]*\)|<img\b[^>]*>", re.IGNORECASE)
+HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+# Lines left with nothing but markup once images are removed
+EMPTY_MARKUP_RE = re.compile(r"^(\s|</?\w+[^>]*>|[|:\-*_#>])*$")
+
+Section = Tuple[Tuple[str, ...], str]
+
+def clean_markdown(text: str, max_code_lines: int = 8) -> str:
+    """Strip markup that carries no searchable meaning
+
+    Badge and image-only lines and HTML comments are dropped, inline images
+    removed, and code blocks longer than `max_code_lines` cut down to their
+    first lines with a note of how many were left out.
+    """
+    text = HTML_COMMENT_RE.sub("", text)
+    lines = []
+    code, fence = None, None
+    for line in text.splitlines():
+        match = FENCE_RE.match(line)
+        if code is not None:
+            if match and match.group(1) == fence:
+                kept = code[:max_code_lines]
+                if len(code) > max_code_lines:
+                    kept.append(f"... ({len(code) - max_code_lines} more lines)")
+                lines.extend(kept)
+                lines.append(line.strip())
+                code, fence = None, None
+            else:
+                code.append(line.rstrip())
+            continue
+        if match:
+            code, fence = [], match.group(1)
+            lines.append(line.strip())
+            continue
+
+        stripped = IMAGE_RE.sub("", line)
+        if stripped != line and EMPTY_MARKUP_RE.match(stripped):
+            continue
+        lines.append(stripped.rstrip())
+    if code is not None:
+        # Unclosed fence: keep what fits, like a closed one
+        lines.extend(code[:max_code_lines])
+
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+def parse_sections(text: str) -> List[Section]:
+    """Split Markdown into `(breadcrumb, body)` sections in document order
+
+    The breadcrumb holds the enclosing headings, outermost first. Text
+    before the first heading has an empty breadcrumb. Headings inside code
+    blocks are ignored.
+    """
+    sections = []
+    stack: List[Tuple[int, str]] = []
+    body: List[str] = []
+    in_code = None
+
+    def close():
+        content = "\n".join(body).strip()
+        if content:
+            sections.append((tuple(title for _, title in stack), content))
+        body.clear()
+
+    for line in text.splitlines():
+        fence = FENCE_RE.match(line)
+        if fence:
+            in_code = None if in_code == fence.group(1) else (in_code or fence.group(1))
+        heading = HEADING_RE.match(line) if in_code is None else None
+        if heading:
+            close()
+            level = len(heading.group(1))
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            stack.append((level, heading.group(2).strip()))
+            continue
+        body.append(line)
+    close()
+    return sections
+
+def _split_long(text: str, chunk_size: int) -> List[str]:
+    """Split text longer than `chunk_size` at paragraph, then line, then character boundaries"""
+    if len(text) <= chunk_size:
+        return [text]
+    pieces = []
+    current = ""
+    for part in text.split("\n\n"):
+        candidate = f"{current}\n\n{part}" if current else part
+        if len(candidate) <= chunk_size:
+            current = candidate
+            continue
+        if current:
+            pieces.append(current)
+        current = ""
+        if len(part) <= chunk_size:
+            current = part
+            continue
+        # A single paragraph over the limit: fall back to lines, then words
+        for line in part.splitlines():
+            while len(line) > chunk_size:
+                if current:
+                    pieces.append(current)
+                    current = ""
+                cut = line.rfind(" ", 0, chunk_size)
+                cut = cut if cut > 0 else chunk_size
+                pieces.append(line[:cut])
+                line = line[cut:].lstrip()
+            candidate = f"{current}\n{line}" if current else line
+            if len(candidate) <= chunk_size:
+                current = candidate
+            else:
+                pieces.append(current)
+                current = line
+    if current:
+        pieces.append(current)
+    return pieces
+
+def _common_prefix(breadcrumbs: List[Tuple[str, ...]]) -> Tuple[str, ...]:
+    prefix = breadcrumbs[0]
+    for breadcrumb in breadcrumbs[1:]:
+        length = 0
+        while length < min(len(prefix), len(breadcrumb)) and prefix[length] == breadcrumb[length]:
+            length += 1
+        prefix = prefix[:length]
+    return prefix
+
+class MarkdownSplitter:
+    """Heading-aware splitter producing few, dense chunks per Markdown document
+
+    - Cleans badges, images and long code blocks (`clean_markdown`).
+    - Splits at headings; consecutive small sections under the same parent
+      heading are packed together up to `chunk_size` characters, and
+      oversized sections are split at paragraph boundaries.
+    - Each chunk starts with the document title and heading breadcrumb, and
+      keeps the breadcrumb in `metadata["headings"]`.
+    - At most `max_chunks` chunks are kept per document; READMEs put the
+      essentials first, so the tail is dropped.
+    """
+
+    def __init__(self, chunk_size: int = 800, max_chunks: int = 8, max_code_lines: int = 8):
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.max_code_lines = max_code_lines
+
+    def split_text(self, text: str) -> List[Tuple[Tuple[str, ...], str]]:
+        """`(breadcrumb, text)` chunks of a Markdown string, before the `max_chunks` cap"""
+        pieces: List[Section] = []
+        for breadcrumb, body in parse_sections(clean_markdown(text, self.max_code_lines)):
+            pieces.extend((breadcrumb, piece) for piece in _split_long(body, self.chunk_size))
+
+        # Pack consecutive pieces that share the first piece's parent heading
+        groups: List[List[Section]] = []
+        for breadcrumb, body in pieces:
+            if groups:
+                group = groups[-1]
+                parent = group[0][0][:-1]
+                size = sum(len(part) + len(" > ".join(crumbs)) + 2 for crumbs, part in group)
+                if breadcrumb[:len(parent)] == parent \
+                        and size + len(body) + len(" > ".join(breadcrumb)) + 2 <= self.chunk_size:
+                    group.append((breadcrumb, body))
+                    continue
+            groups.append([(breadcrumb, body)])
+
+        chunks = []
+        for group in groups:
+            prefix = _common_prefix([breadcrumb for breadcrumb, _ in group])
+            parts = []
+            for breadcrumb, body in group:
+                # Headings below the shared breadcrumb stay inline so packed sections remain labelled
+                inner = breadcrumb[len(prefix):]
+                parts.append(f"{' > '.join(inner)}:\n{body}" if inner else body)
+            chunks.append((prefix, "\n\n".join(parts)))
+        return chunks
+
+    def split_documents(self, documents: List[Document], title: Optional[str] = None) -> List[Document]:
+        """Split documents into chunks that inherit their metadata plus `headings`"""
+        chunks = []
+        for doc in documents:
+            heading = title or doc.metadata.get("title") or doc.metadata.get("name", "")
+            pieces = self.split_text(doc.page_content)
+            if len(pieces) > self.max_chunks:
+                print(f"✂️ Keeping {self.max_chunks} of {len(pieces)} chunks for {heading}")
+                pieces = pieces[:self.max_chunks]
+            for breadcrumb, text in pieces:
+                label = " > ".join((heading,) + breadcrumb) if heading else " > ".join(breadcrumb)
+                chunks.append(Document(
+                    page_content=f"{label}:\n{text}" if label else text,
+                    metadata=dict(doc.metadata, headings=" > ".join(breadcrumb))
+                ))
+        return chunks
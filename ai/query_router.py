@@ -0,0 +1,243 @@
+"""
+Rule-based router that answers structured questions without retrieval or the LLM
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+import config
+
+# Patterns are matched against the whole normalized question (see `_normalize`), so a
+# keyword inside a longer question ("the email spam classifier") never triggers a
+# canned answer. Anything that does not match exactly goes through RAG.
+SUBJECT = r"(you|sankalp( singh)?|him)"
+OWNER = r"(your|sankalp'?s|his)"
+REPOS = r"(repos|repositories|projects)"
+# A language name as written in a question; checked against the indexed languages
+LANGUAGE = r"(?P<language>[\w+#.]+( [\w+#.]+)?)"
+
+CONTACT_PATTERNS = [
+    re.compile(
+        rf"((how|where) (can|do|could|should) i |can i |i (want|would like) to )?"
+        rf"(contact|reach( out to)?|email|e-mail|get in touch with|connect with) {SUBJECT}"
+        rf"( (by|via|on) (email|e-mail|linkedin|twitter|github))?"
+    ),
+    re.compile(
+        rf"(what('s| is| are) |share |give me |can i (have|get) )?{OWNER} "
+        rf"(email|e-mail|linkedin|twitter|github|contact (details|info|information)|socials|social links)"
+        rf"( (address|profile|link|url|handle|account|username))?"
+    ),
+    re.compile(r"contact( (details|info|information))?"),
+]
+SKILLS_PATTERNS = [
+    re.compile(
+        rf"(what are |what're |list |show( me)? |tell me( about)? )?{OWNER} (main |key |core |top )?"
+        rf"(technical )?(skills|skill set|skillset|tech stack|technologies)"
+    ),
+    re.compile(rf"what (technologies|skills|tools|languages) (do|does) {SUBJECT} (know|use|have|work with)"),
+    re.compile(r"(technical )?skills"),
+]
+REPO_COUNT_PATTERN = re.compile(
+    rf"how many (public |github )*({LANGUAGE} )?{REPOS}"
+    rf"( (do|does) {SUBJECT} have| are there| have you (built|made|published))?"
+    rf"( on github| in (?P<language_in>[\w+#.]+( [\w+#.]+)?))?"
+)
+STAR_COUNT_PATTERNS = [
+    re.compile(
+        rf"how many (github )?stars (do|does) {SUBJECT} have"
+        rf"( in total| on github| across( all)?( your| his)? {REPOS})?"
+    ),
+    re.compile(rf"(what('s| is) )?({OWNER}|the) total (number of )?(github )?stars( count)?( on github)?"),
+]
+REPO_STARS_PATTERN = re.compile(r"how many stars (does|do) (the )?(?P<repo>.+?)( (repo|repository|project))? (have|get|got)")
+MOST_STARRED_PATTERN = re.compile(
+    rf"(what are |what is |which are |which is |show( me)? |list )?({OWNER} )?"
+    rf"(most (starred|popular)|top( \d+)?( starred)?) (github )?{REPOS}( on github)?"
+)
+REPOS_BY_LANGUAGE_PATTERNS = [
+    re.compile(rf"(which|what|list|show( me)?)( are| of)?( {OWNER})? {LANGUAGE} {REPOS}( (do|does) {SUBJECT} have)?"),
+    re.compile(rf"(which|what) {REPOS} (are |were )?(written |built )?in {LANGUAGE}"),
+]
+# Questions that need explanation rather than a lookup
+COMPLEX_PATTERN = re.compile(
+    r"\b(why|how does|how do|how did|explain|compare|difference|describe|walk me through|architecture)\b"
+)
+
+def _normalize(question: str) -> str:
+    """Lowercase, trim politeness and trailing punctuation, collapse whitespace"""
+    text = " ".join(question.lower().split())
+    text = re.sub(r"[?!.\s]+$", "", text)
+    text = re.sub(r"^(please|hey|hi)[, ]+|[, ]+please$", "", text)
+    return text.strip()
+
+def _fullmatch(patterns, text: str):
+    for pattern in patterns:
+        match = pattern.fullmatch(text)
+        if match:
+            return match
+    return None
+
+def _mentions(term: str, text: str) -> bool:
+    """Whole-word, case-insensitive match that also works for terms like C++"""
+    return re.search(rf"(?<![\w+#]){re.escape(term.lower())}(?![\w+#])", text) is not None
+
+class QueryRouter:
+    """Answers structured questions from config and repository aggregates
+
+    Intents are recognised with cheap rules that must match the whole
+    question: contact details, skills, repository counts, star totals, the
+    most starred repositories and repositories by language. Anything with
+    an extra qualifier ("how many projects with computer vision?") or that
+    is otherwise not an exact match returns None from `route` and goes
+    through the full RAG path. Aggregates are recomputed whenever the
+    knowledge base is (re)built from a repository list.
+    """
+
+    def __init__(self, personal_info: Optional[Dict] = None,
+                 skills: Optional[Dict[str, List[str]]] = None):
+        self.personal_info = personal_info or config.PERSONAL_INFO
+        self.skills = skills or config.SKILLS
+        self.aggregates = None
+        self.stats = {}
+
+    def update_repos(self, repos: List[Dict]):
+        """Precompute the aggregates used to answer repository questions"""
+        by_language = {}
+        for repo in repos:
+            if repo.get('language'):
+                by_language.setdefault(repo['language'], []).append(repo)
+
+        self.aggregates = {
+            "count": len(repos),
+            "stars": sum(repo.get('stargazers_count', 0) for repo in repos),
+            "forks": sum(repo.get('forks_count', 0) for repo in repos),
+            "by_language": by_language,
+            "by_stars": sorted(repos, key=lambda r: r.get('stargazers_count', 0), reverse=True),
+            # Longest names first so "agentic-qa-app" wins over "qa"
+            "names": sorted(
+                ((repo.get('name', ''), repo) for repo in repos if repo.get('name')),
+                key=lambda item: len(item[0]),
+                reverse=True
+            )
+        }
+
+    def route(self, question: str) -> Optional[Tuple[str, str]]:
+        """Return `(intent, answer)` for structured questions, otherwise None"""
+        text = _normalize(question)
+        for intent, handler in (
+            ("contact", self._answer_contact),
+            ("repo_stars", self._answer_repo_stars),
+            ("most_starred", self._answer_most_starred),
+            ("star_count", self._answer_star_count),
+            ("repo_count", self._answer_repo_count),
+            ("repos_by_language", self._answer_repos_by_language),
+            ("skills", self._answer_skills),
+        ):
+            answer = handler(text)
+            if answer:
+                self.stats[intent] = self.stats.get(intent, 0) + 1
+                return intent, answer
+        return None
+
+    def is_simple(self, question: str) -> bool:
+        """Short factual questions a smaller, faster model can handle"""
+        return len(question.split()) <= 12 and not COMPLEX_PATTERN.search(question.lower())
+
+    def _find_repo(self, text: str) -> Optional[Dict]:
+        """Repository mentioned by name, allowing spaces for hyphens"""
+        for name, repo in self.aggregates["names"]:
+            if _mentions(name, text) or _mentions(re.sub(r"[-_]", " ", name), text):
+                return repo
+        return None
+
+    def _format_repo(self, repo: Dict) -> str:
+        return (
+            f"**{repo.get('name', '')}** ⭐ {repo.get('stargazers_count', 0)}"
+            f" — {repo.get('html_url', '')}"
+        )
+
+    def _answer_contact(self, text: str) -> Optional[str]:
+        if not _fullmatch(CONTACT_PATTERNS, text):
+            return None
+        info = self.personal_info
+        fields = [
+            ("email", "Email", lambda t: re.search(r"\be-?mail\b", t)),
+            ("linkedin", "LinkedIn", lambda t: "linkedin" in t),
+            ("github", "GitHub", lambda t: "github" in t),
+            ("twitter", "Twitter", lambda t: "twitter" in t),
+        ]
+        asked = [(key, label) for key, label, match in fields if match(text) and info.get(key)]
+        lines = [f"- {label}: {info[key]}" for key, label in (asked or [
+            (key, label) for key, label, _ in fields if info.get(key)
+        ])]
+        return f"You can reach {info['name']} here:\n" + "\n".join(lines)
+
+    def _answer_repo_stars(self, text: str) -> Optional[str]:
+        match = REPO_STARS_PATTERN.fullmatch(text) if self.aggregates else None
+        if not match:
+            return None
+        repo = self._find_repo(match.group("repo"))
+        if not repo or not self._is_repo_name(match.group("repo"), repo):
+            return None
+        return f"**{repo.get('name', '')}** has {repo.get('stargazers_count', 0)} stars and {repo.get('forks_count', 0)} forks."
+
+    def _answer_most_starred(self, text: str) -> Optional[str]:
+        if not self.aggregates or not MOST_STARRED_PATTERN.fullmatch(text):
+            return None
+        top = self.aggregates["by_stars"][:3]
+        if not top:
+            return None
+        return "The most starred projects are:\n" + "\n".join(f"- {self._format_repo(repo)}" for repo in top)
+
+    def _answer_star_count(self, text: str) -> Optional[str]:
+        if not self.aggregates or not _fullmatch(STAR_COUNT_PATTERNS, text):
+            return None
+        agg = self.aggregates
+        return f"Across {agg['count']} public repositories there are {agg['stars']} stars and {agg['forks']} forks in total."
+
+    def _answer_repo_count(self, text: str) -> Optional[str]:
+        """Total or per-language repository count; None for any other qualifier"""
+        match = REPO_COUNT_PATTERN.fullmatch(text) if self.aggregates else None
+        if not match:
+            return None
+        qualifiers = [q for q in (match.group("language"), match.group("language_in")) if q]
+        languages = []
+        for qualifier in qualifiers:
+            language = self._language(qualifier)
+            if language is None:
+                # "how many ML projects", "how many projects in your internship": not a lookup
+                return None
+            languages.append(language)
+        if languages:
+            count = sum(len(self.aggregates["by_language"][language]) for language in set(languages))
+            noun = "repository is" if count == 1 else "repositories are"
+            return f"{count} public {noun} written in {' / '.join(sorted(set(languages)))}."
+        return f"There are {self.aggregates['count']} public repositories on GitHub."
+
+    def _language(self, text: str) -> Optional[str]:
+        """Indexed language named exactly by `text`, if any"""
+        for language in self.aggregates["by_language"]:
+            if language.lower() == text.strip():
+                return language
+        return None
+
+    def _is_repo_name(self, text: str, repo: Dict) -> bool:
+        """Whether `text` is the repository's name (hyphens may be spaces), not a longer phrase"""
+        name = repo.get('name', '').lower()
+        return text.strip() in (name, re.sub(r"[-_]", " ", name))
+
+    def _answer_repos_by_language(self, text: str) -> Optional[str]:
+        match = _fullmatch(REPOS_BY_LANGUAGE_PATTERNS, text) if self.aggregates else None
+        if not match:
+            return None
+        language = self._language(match.group("language"))
+        if language is None:
+            return None
+        repos = self.aggregates["by_language"][language]
+        lines = [f"**{language}** ({len(repos)}):"]
+        lines.extend(f"- {self._format_repo(repo)}" for repo in repos)
+        return "\n".join(lines)
+
+    def _answer_skills(self, text: str) -> Optional[str]:
+        if not _fullmatch(SKILLS_PATTERNS, text):
+            return None
+        lines = [f"- **{category}:** {', '.join(skills)}" for category, skills in self.skills.items()]
+        return f"{self.personal_info['name']}'s technical skills:\n" + "\n".join(lines)
@@ -1,248 +1,801 @@
 """
 RAG Engine for AI Chatbot
 """
-import os
-from langchain_groq import ChatGroq
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langchain_community.vectorstores import Chroma
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from langchain_core.documents import Document
 import config
-import PyPDF2
+from ai import manifest as kb_manifest
+from ai.answer_cache import AnswerCache
+from ai.context_builder import build_context
+from ai.conversation import ConversationMemory, ConversationStore, format_turns, is_follow_up
+from ai.embeddings import create_embedding_service
+from ai.hybrid_search import BM25Index, reciprocal_rank_fusion
+from ai.llm_router import configured_models, create_llm_router
+from ai.markdown_splitter import MarkdownSplitter
+from ai.query_router import QueryRouter
+from ai.reranker import create_reranker
+from ai.sources import LOCAL_SOURCE_TYPES, MARKDOWN_SOURCE_TYPES, ReadmeSource, RepositorySource, local_sources, stream_documents
+from ai.vector_store import create_vector_store
+
+# System message with instructions
+SYSTEM_PROMPT = """You are an AI assistant representing Sankalp Singh, an AI Engineer.
+You have access to information from:
+1. GitHub repositories and projects
+2. Personal information and bio
+3. Detailed resume including education, work experience, skills, and achievements
+
+When answering questions:
+- Use specific details from the provided context
+- For resume questions (education, work experience, skills), refer to the RESUME CONTENT sections
+- Be conversational and helpful
+- If asked about specific experiences or qualifications, cite them from the resume
+- If the information isn't in the context, say so politely
+- Use the conversation so far to understand follow-up questions
+
+Conversation so far:
+{history}
+
+Context from knowledge base:
+{context}
+
+Answer the following question based on the context above:"""
+
+# Turns a follow-up into a query that retrieval can use without the conversation
+REWRITE_PROMPT = """Rewrite the visitor's follow-up question as a standalone question about Sankalp Singh's portfolio, using the conversation to resolve words like "it" or "that project".
+Reply with the rewritten question only.
+
+Conversation:
+{history}
+
+Follow-up question: {question}
+Standalone question:"""
+
+SUMMARY_PROMPT = """Update the running summary of a conversation between a visitor and Sankalp Singh's portfolio assistant.
+Keep the projects, skills and facts the visitor asked about and what they were told. Use at most {max_chars} characters.
+
+Current summary:
+{summary}
+
+New turns:
+{turns}
+
+Updated summary:"""
 
 class RAGEngine:
     """RAG-based chatbot engine"""
     
-    def __init__(self, use_groq=True):
-        """Initialize the RAG engine"""
+    EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+    CHUNK_SIZE = 300  # Reduced from 500 for more precise chunks
+    CHUNK_OVERLAP = 50
+    
+    def __init__(self, use_groq=True, router=None, with_llm=True):
+        """Initialize the RAG engine
+        
+        `with_llm=False` skips the LLM clients, for offline index builds that
+        only chunk and embed.
+        """
         self.use_groq = use_groq
+        self.chain = None
+        self.fast_chain = None
+        self.rewrite_chain = None
+        self.summary_chain = None
         
-        # Initialize LLM
-        if use_groq and config.GROQ_API_KEY:
-            self.llm = ChatGroq(
-                groq_api_key=config.GROQ_API_KEY,
-                model_name="llama-3.3-70b-versatile",  # Updated to current model
-                temperature=0.7
+        if with_llm:
+            # LLM pool: providers from config.LLM_MODELS, with failover and latency tracking
+            models = configured_models(use_groq)
+            if not models:
+                raise ValueError("No API key found for LLM")
+            
+            from langchain_core.prompts import ChatPromptTemplate
+            prompt = ChatPromptTemplate.from_messages([
+                ("system", SYSTEM_PROMPT),
+                ("human", "{question}")
+            ])
+            self.chain = create_llm_router(prompt, models)
+            
+            # Optional smaller model for short factual questions, falling back to the full pool
+            fast_models = models
+            if config.FAST_LLM_MODEL and use_groq and config.GROQ_API_KEY:
+                fast_models = [("groq", config.FAST_LLM_MODEL)] + models
+                self.fast_chain = create_llm_router(prompt, fast_models)
+            
+            # Follow-up rewriting and conversation summaries, on the fast model when there is one
+            self.rewrite_chain = create_llm_router(
+                ChatPromptTemplate.from_messages([("human", REWRITE_PROMPT)]),
+                fast_models,
+                timeout=config.CONVERSATION_REWRITE_TIMEOUT
             )
-        elif config.GOOGLE_API_KEY:
-            self.llm = ChatGoogleGenerativeAI(
-                google_api_key=config.GOOGLE_API_KEY,
-                model="gemini-pro",
-                temperature=0.7
+            self.summary_chain = create_llm_router(
+                ChatPromptTemplate.from_messages([("human", SUMMARY_PROMPT)]),
+                fast_models
             )
-        else:
-            raise ValueError("No API key found for LLM")
         
-        # Initialize embeddings
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2"
+        # Structured questions answered without retrieval or the LLM
+        self.router = router or QueryRouter()
+        
+        # Bounded pool for blocking retrieval work from async callers
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.RETRIEVAL_WORKERS,
+            thread_name_prefix="retrieval"
+        )
+        
+        # Per-session conversation memory; older turns are summarized off the request path
+        self.conversations = ConversationStore(
+            max_sessions=config.CONVERSATION_MAX_SESSIONS,
+            ttl=config.CONVERSATION_TTL,
+            **self._memory_settings()
         )
+        self._memory_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="conversation")
+        
+        # Initialize embeddings
+        self.embeddings = create_embedding_service(self.EMBEDDING_MODEL)
+        # Optional cross-encoder second stage; offline builds never query
+        self.reranker = create_reranker() if with_llm else None
         
         # Vector store
+        self.persist_directory = config.CHROMA_PERSIST_DIR
+        self.vector_backend = config.VECTOR_BACKEND
+        # Set when serving a pre-built artifact, which is never modified
+        self.read_only = False
         self.vector_store = None
+        # Heading-aware splitter for READMEs and Markdown files
+        self.markdown_splitter = MarkdownSplitter(
+            chunk_size=config.MARKDOWN_CHUNK_SIZE,
+            max_chunks=config.MARKDOWN_MAX_CHUNKS,
+            max_code_lines=config.MARKDOWN_MAX_CODE_LINES
+        )
+        # Keyword index over the same chunks, kept in step with the vector store
+        self.keyword_index = BM25Index()
+        self.kb_version = None
         self.is_initialized = False
+        # Set once the first batch of a build is searchable, before the build finishes
+        self.is_searchable = False
+        # Optional callback(chunks_embedded) after each indexed batch
+        self.on_batch_indexed = None
+        
+        # Answers to repeated and near-duplicate questions, per index version
+        self.answer_cache = AnswerCache(
+            embed_query=self.embeddings.embed_query_array,
+            max_entries=config.ANSWER_CACHE_SIZE,
+            ttl=config.ANSWER_CACHE_TTL,
+            similarity_threshold=config.ANSWER_CACHE_SIMILARITY
+        )
+        # Serializes index builds from startup, the refresh endpoint and the background refresher
+        self._index_lock = threading.Lock()
     
     def initialize_knowledge_base(self, repos=None, github_api=None):
         """Initialize vector store with repository data"""
-        if self.is_initialized:
-            return
+        with self._index_lock:
+            if self.is_initialized:
+                return
+            
+            if repos is not None:
+                self.router.update_repos(repos)
+            previous = self._open_indexed_store()
+            if previous is not None:
+                # Warm start: only re-fetch and re-embed what changed since the last run
+                self._refresh_from_manifest(previous, repos, github_api)
+            else:
+                self._rebuild_knowledge_base(repos, github_api)
+            
+            self.is_initialized = True
+    
+    def refresh_knowledge_base(self, repos=None, github_api=None):
+        """Re-embed only the repositories that changed since the last index build
         
-        documents = []
+        Repositories are compared on `updated_at`/`pushed_at` and README SHA;
+        changed chunks are upserted and chunks of deleted repositories removed.
+        Passing `repos=None` leaves all repository chunks untouched.
+        """
+        with self._index_lock:
+            if self.read_only:
+                print("ℹ️ Serving a pre-built knowledge-base artifact, skipping refresh")
+                return {"added": [], "updated": [], "removed": [], "unchanged": 0,
+                        "embedded": 0, "deleted": 0, "read_only": True}
+            if repos is not None:
+                self.router.update_repos(repos)
+            previous = self._open_indexed_store()
+            if previous is None:
+                summary = self._rebuild_knowledge_base(repos, github_api)
+            else:
+                summary = self._refresh_from_manifest(previous, repos, github_api)
+            
+            self.is_initialized = True
+            return summary
+    
+    def load_artifact(self, path):
+        """Serve a knowledge base built offline by `python -m ai.build_index`
+        
+        The artifact is opened read-only: vectors are memory-mapped and no
+        GitHub or embedding work is done. Returns False, leaving the engine
+        untouched, if the artifact is missing or was built with other settings.
+        """
+        from ai.vector_store import NumpyVectorStore
+        
+        with self._index_lock:
+            info = kb_manifest.load_artifact_info(path)
+            manifest = kb_manifest.load_manifest(path)
+            settings = dict(self._index_settings(), vector_backend="numpy")
+            if info is None or not kb_manifest.is_compatible(manifest, settings):
+                print(f"⚠️ No compatible knowledge-base artifact at {path}")
+                return False
+            
+            store = NumpyVectorStore(self.embeddings, path, read_only=True)
+            stored = store.get()
+            if set(stored["ids"]) != set(manifest["chunks"]):
+                print(f"⚠️ Knowledge-base artifact at {path} does not match its manifest")
+                return False
+            
+            self.vector_store = store
+            self.keyword_index.clear()
+            self.keyword_index.add(stored["ids"], [
+                Document(page_content=text, metadata=metadata)
+                for text, metadata in zip(stored["documents"], stored["metadatas"])
+            ])
+            self.router.update_repos(info.get("repos", []))
+            self.kb_version = kb_manifest.manifest_digest(manifest)
+            self.read_only = True
+            self.is_initialized = True
+            print(f"📦 Loaded knowledge-base artifact built {info.get('built_at')} ({len(stored['ids'])} chunks)")
+            return True
+    
+    def _rebuild_knowledge_base(self, repos, github_api):
+        """Build the whole knowledge base from scratch"""
+        repos = repos or []
+        repo_state = {repo.get('name', ''): self._repo_fingerprint(repo, None) for repo in repos}
+        
+        def record_readme(repo, readme):
+            repo_state[repo.get('name', '')] = self._repo_fingerprint(repo, readme)
+            if readme:
+                print(f"  ✅ Added README for {repo.get('name', '')}")
+        
+        def forget_repo(repo):
+            # Left out of the manifest so the next refresh fetches the README again
+            repo_state.pop(repo.get('name', ''), None)
+        
+        # Small local sources first, so they are searchable while READMEs are still being fetched
+        sources = local_sources() + [
+            RepositorySource(repos),
+            ReadmeSource(repos, github_api, config.README_BATCH_SIZE,
+                         on_fetched=record_readme, on_failed=forget_repo)
+        ]
+        counts = self._sync_vector_store(stream_documents(sources), repo_state)
+        return {
+            "added": sorted(repo.get('name', '') for repo in repos),
+            "updated": [],
+            "removed": [],
+            "unchanged": 0,
+            **counts
+        }
+    
+    def _refresh_from_manifest(self, previous, repos, github_api):
+        """Diff repositories against the manifest and sync only what changed"""
+        indexed_repos = previous.get("repos", {})
+        repo_state = dict(indexed_repos)
+        sources = local_sources()
+        # Local sources are rebuilt every time; indexed resume sections or files that disappeared are dropped
+        replace_sources = {
+            key for key in previous["sources"]
+            if key.partition(":")[0] in LOCAL_SOURCE_TYPES
+        }
+        summary = {"added": [], "updated": [], "removed": [], "unchanged": 0}
         
-        # Create documents from repositories if provided
-        if repos:
+        if repos is not None:
+            current_names = {repo.get('name', '') for repo in repos}
+            changed = []
             for repo in repos:
-                # Basic metadata document
-                content = f"""
-                Project: {repo.get('name', '')}
-                Description: {repo.get('description', 'No description')}
-                Language: {repo.get('language', 'N/A')}
-                Stars: {repo.get('stargazers_count', 0)}
-                Forks: {repo.get('forks_count', 0)}
-                Topics: {', '.join(repo.get('topics', []))}
-                Created: {repo.get('created_at', '')[:10]}
-                Updated: {repo.get('updated_at', '')[:10]}
-                URL: {repo.get('html_url', '')}
-                """
-                
-                doc = Document(
-                    page_content=content,
-                    metadata={
-                        "name": repo.get('name', ''),
-                        "url": repo.get('html_url', ''),
-                        "language": repo.get('language', ''),
-                        "type": "repo_metadata"
-                    }
-                )
-                documents.append(doc)
-                
-                # Fetch and add README content if available
-                if github_api:
-                    readme = github_api.get_readme(repo.get('name', ''))
-                    if readme:
-                        readme_doc = Document(
-                            page_content=f"""
-                            PROJECT README - {repo.get('name', '')}:
-                            
-                            {readme}
-                            
-                            Project URL: {repo.get('html_url', '')}
-                            """,
-                            metadata={
-                                "name": repo.get('name', ''),
-                                "url": repo.get('html_url', ''),
-                                "type": "readme",
-                                "source": f"{repo.get('name', '')}/README.md"
-                            }
-                        )
-                        documents.append(readme_doc)
-                        print(f"  ✅ Added README for {repo.get('name', '')}")
-        
-        
-        # Add personal information
-        personal_doc = Document(
-            page_content=f"""
-            Name: {config.PERSONAL_INFO['name']}
-            Title: {config.PERSONAL_INFO['title']}
-            Bio: {config.PERSONAL_INFO['bio']}
-            Skills: {', '.join([skill for skills in config.SKILLS.values() for skill in skills])}
+                known = indexed_repos.get(repo.get('name', ''))
+                if known and known["updated_at"] == repo.get('updated_at') \
+                        and known["pushed_at"] == repo.get('pushed_at'):
+                    summary["unchanged"] += 1
+                else:
+                    changed.append(repo)
             
-            I am an AI Engineer specializing in Machine Learning, Deep Learning, Gen AI, and Agentic AI.
-            I have experience with Python, TensorFlow, PyTorch, LangChain, FastAPI, and React.
-            I build intelligent systems and transform complex problems into elegant solutions.
-            """,
-            metadata={"type": "personal_info"}
-        )
-        documents.append(personal_doc)
-        
-        # Add resume content with improved project extraction
-        try:
-            resume_path = "Sankalp_Singh_resume.pdf"
-            if os.path.exists(resume_path):
-                with open(resume_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    resume_text = ""
-                    for page in pdf_reader.pages:
-                        resume_text += page.extract_text() + "\n"
-                    
-                    # Full resume document
-                    resume_doc = Document(
-                        page_content=f"""
-                        COMPLETE RESUME CONTENT:
-                        {resume_text}
-                        
-                        KEY RESUME PROJECTS (Featured):
-                        - StudyBuddy: AI-powered study companion application
-                        - PromptBoost: Advanced prompt engineering tool
-                        - AgenticQA: Intelligent question-answering system using agentic AI
-                        
-                        These are the main projects highlighted in Sankalp Singh's resume.
-                        When asked about resume projects, refer to these three featured projects.
-                        """,
-                        metadata={"type": "resume", "source": "Sankalp_Singh_resume.pdf"}
-                    )
-                    documents.append(resume_doc)
-                    print(f"✅ Added resume to knowledge base with featured projects")
-        except Exception as e:
-            print(f"⚠️ Could not load resume: {e}")
-        
-        # If we have documents, create vector store
-        if documents:
-            # Split documents - reduced chunk size for better granularity
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=300,  # Reduced from 500 for more precise chunks
-                chunk_overlap=50
-            )
-            splits = text_splitter.split_documents(documents)
+            known_shas = {}
+            for repo in changed:
+                name = repo.get('name', '')
+                known = indexed_repos.get(name)
+                summary["updated" if known else "added"].append(name)
+                replace_sources.add(f"repo_metadata:{name}")
+                readme_sha = known.get("readme_sha") if known else None
+                if readme_sha:
+                    known_shas[name] = readme_sha
+                repo_state[name] = self._repo_fingerprint(repo, {"sha": readme_sha})
+            
+            def record_readme(repo, readme):
+                name = repo.get('name', '')
+                sha = readme.get('sha') if readme else None
+                # Only a README whose blob changed (or disappeared) replaces the indexed chunks
+                if sha is None or sha != known_shas.get(name):
+                    replace_sources.add(f"readme:{name}")
+                repo_state[name] = self._repo_fingerprint(repo, readme)
+            
+            def keep_readme(repo):
+                # Keep the indexed README and the old fingerprint, so the next refresh retries
+                name = repo.get('name', '')
+                if name in indexed_repos:
+                    repo_state[name] = indexed_repos[name]
+                else:
+                    repo_state.pop(name, None)
+            
+            sources += [
+                RepositorySource(changed),
+                ReadmeSource(changed, github_api, config.README_BATCH_SIZE, on_fetched=record_readme,
+                             on_failed=keep_readme, known_shas=known_shas)
+            ]
             
-            # Create vector store
-            self.vector_store = Chroma.from_documents(
-                documents=splits,
-                embedding=self.embeddings,
-                persist_directory="./chroma_db"
+            # Repositories that are indexed but no longer exist on GitHub
+            for key in previous["sources"]:
+                doc_type, _, name = key.partition(":")
+                if doc_type in ("repo_metadata", "readme") and name not in current_names:
+                    replace_sources.add(key)
+                    repo_state.pop(name, None)
+                    if name not in summary["removed"]:
+                        summary["removed"].append(name)
+        
+        counts = self._sync_vector_store(stream_documents(sources), repo_state, previous, replace_sources)
+        summary.update(counts)
+        return summary
+    
+    def _repo_fingerprint(self, repo, readme):
+        """Fields used to detect whether a repository needs re-indexing"""
+        return {
+            "updated_at": repo.get('updated_at'),
+            "pushed_at": repo.get('pushed_at'),
+            "readme_sha": readme.get('sha') if readme else None
+        }
+    
+    def _index_settings(self):
+        """Settings that must match for persisted vectors to be reusable"""
+        return {
+            "embedding_model": self.EMBEDDING_MODEL,
+            "normalized_embeddings": True,
+            "vector_backend": self.vector_backend,
+            "chunk_size": self.CHUNK_SIZE,
+            "chunk_overlap": self.CHUNK_OVERLAP,
+            "chunk_start_index": True,
+            "markdown_chunk_size": config.MARKDOWN_CHUNK_SIZE,
+            "markdown_max_chunks": config.MARKDOWN_MAX_CHUNKS,
+            "markdown_max_code_lines": config.MARKDOWN_MAX_CODE_LINES,
+        }
+    
+    def _split_documents(self, documents):
+        """Split documents into retrieval chunks
+        
+        READMEs and Markdown files are split along their heading structure
+        into a few dense chunks; everything else by character count.
+        """
+        markdown = [doc for doc in documents if doc.metadata.get("type") in MARKDOWN_SOURCE_TYPES]
+        plain = [doc for doc in documents if doc.metadata.get("type") not in MARKDOWN_SOURCE_TYPES]
+        chunks = []
+        if markdown:
+            chunks.extend(self.markdown_splitter.split_documents(markdown))
+        if plain:
+            from langchain_text_splitters import RecursiveCharacterTextSplitter
+            text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=self.CHUNK_SIZE,
+                chunk_overlap=self.CHUNK_OVERLAP,
+                add_start_index=True  # Lets the context builder stitch overlapping chunks back together
             )
+            chunks.extend(text_splitter.split_documents(plain))
+        return chunks
+    
+    def _open_vector_store(self):
+        """Open (or create) the persisted vector store for the configured backend"""
+        return create_vector_store(self.embeddings, self.persist_directory, self.vector_backend)
+    
+    def _open_indexed_store(self):
+        """Open the persisted store and return its manifest if it can be reused
+        
+        A store whose manifest is missing, was built with other settings or
+        does not match the stored ids is emptied and None is returned.
+        """
+        previous = kb_manifest.load_manifest(self.persist_directory)
+        self.vector_store = self._open_vector_store()
         
-        self.is_initialized = True
+        if kb_manifest.is_compatible(previous, self._index_settings()):
+            stored = self.vector_store.get(include=["documents", "metadatas"])
+            ids = stored["ids"]
+            if len(ids) == len(previous["chunks"]) and set(ids) == set(previous["chunks"]):
+                # Chunk ids are content-addressed, so only ids the keyword index lacks need tokenizing
+                known = self.keyword_index.ids()
+                self.keyword_index.remove(known - set(ids))
+                missing = [i for i, chunk_id in enumerate(ids) if chunk_id not in known]
+                self.keyword_index.add([ids[i] for i in missing], [
+                    Document(page_content=stored["documents"][i], metadata=stored["metadatas"][i] or {})
+                    for i in missing
+                ])
+                return previous
+            print("⚠️ Vector store does not match its manifest, rebuilding...")
+        
+        # Unknown or stale layout: start again from an empty collection
+        self.vector_store.delete_collection()
+        self.vector_store = self._open_vector_store()
+        self.keyword_index.clear()
+        return None
     
-    def get_response(self, question, chat_history=None):
-        """Get response from RAG engine"""
-        if not self.is_initialized:
-            return "Please wait while I initialize my knowledge base..."
+    def _sync_vector_store(self, documents, repo_state, previous=None, replace_sources=None):
+        """Bring the persisted vector store in line with a stream of documents
+        
+        Documents are split and embedded `INDEX_BATCH_SIZE` chunks at a
+        time, and each batch is searchable as soon as it is added, so memory
+        stays flat and early sources are available before the last one is
+        read. Chunks are content-addressed, so only chunks missing from the
+        manifest are embedded. With `replace_sources` only chunks of those
+        sources (and of the streamed documents) are diffed and every other
+        indexed chunk is kept; otherwise the documents replace the whole
+        store. Stale chunks are deleted once the stream is exhausted.
+        `repo_state` and `replace_sources` are read at the end, so sources
+        may fill them while they stream.
+        """
+        indexed = previous["chunks"] if previous else {}
+        manifest = kb_manifest.new_manifest(self._index_settings())
+        seen = {}
+        pending = []
+        embedded = 0
+        
+        def flush():
+            nonlocal embedded
+            if pending:
+                chunk_ids, chunks = zip(*pending)
+                self.vector_store.add_documents(list(chunks), ids=list(chunk_ids))
+                self.keyword_index.add(list(chunk_ids), list(chunks))
+                embedded += len(pending)
+                pending.clear()
+                self.is_searchable = True
+                if self.on_batch_indexed:
+                    self.on_batch_indexed(embedded)
+        
+        for doc in documents:
+            manifest["sources"][kb_manifest.source_key(doc.metadata)] = kb_manifest.hash_document(doc)
+            chunks = self._split_documents([doc])
+            for chunk_id, chunk in zip(kb_manifest.chunk_ids(chunks, seen), chunks):
+                manifest["chunks"][chunk_id] = kb_manifest.source_key(chunk.metadata)
+                if chunk_id not in indexed:
+                    pending.append((chunk_id, chunk))
+            if len(pending) >= config.INDEX_BATCH_SIZE:
+                flush()
+        flush()
+        
+        if previous and replace_sources is not None:
+            replace_sources = replace_sources | set(manifest["sources"])
+            for chunk_id, key in indexed.items():
+                if key not in replace_sources:
+                    manifest["chunks"].setdefault(chunk_id, key)
+            for key, digest in previous["sources"].items():
+                if key not in replace_sources:
+                    manifest["sources"].setdefault(key, digest)
+        
+        stale = [chunk_id for chunk_id in indexed if chunk_id not in manifest["chunks"]]
+        if stale:
+            self.vector_store.delete(ids=stale)
+            self.keyword_index.remove(stale)
         
+        # Write the store once per sync, before the manifest that describes it
+        if hasattr(self.vector_store, "flush"):
+            self.vector_store.flush()
+        manifest["repos"] = repo_state
+        kb_manifest.save_manifest(self.persist_directory, manifest)
+        # A new version invalidates cached answers on their next lookup
+        self.kb_version = kb_manifest.manifest_digest(manifest)
+        
+        if embedded or stale:
+            print(f"✅ Embedded {embedded} new chunks, removed {len(stale)} stale chunks")
+        else:
+            print(f"♻️ Reusing {len(manifest['chunks'])} persisted chunks, nothing to embed")
+        
+        return {"embedded": embedded, "deleted": len(stale)}
+    
+    def _not_ready_message(self):
+        """Message to return instead of an answer while the knowledge base is unavailable"""
+        if not (self.is_initialized or self.is_searchable):
+            return "Please wait while I initialize my knowledge base..."
         if not self.vector_store:
             return "Knowledge base is not available. Please initialize first."
+        return None
+    
+    def _retrieve(self, question, k=None):
+        """Retrieve the chunks most relevant to a question
         
-        # Retrieve relevant documents - increased from 3 to 5 for better resume coverage
-        docs = self.vector_store.similarity_search(question, k=5)
+        With the reranker enabled, `RERANK_FETCH_K` first-stage candidates
+        are rescored by the cross-encoder and between `RERANK_MIN_K` and `k`
+        of them are kept, depending on their scores.
+        """
+        k = k or config.RETRIEVAL_K
+        if self.reranker is None:
+            return self._search(question, k)
+        candidates = self._search(question, max(k, config.RERANK_FETCH_K))
+        return self.reranker.select(question, candidates, max_k=k)
+    
+    def _search(self, question, k):
+        """First-stage retrieval
         
-        # Create context from retrieved documents
-        context_parts = []
-        for i, doc in enumerate(docs):
-            source_type = doc.metadata.get('type', 'unknown')
-            context_parts.append(f"[Source {i+1} - {source_type}]:\n{doc.page_content}")
+        With hybrid search, vector and BM25 candidates are fused with
+        reciprocal rank fusion, so exact repository names are found even
+        when their embeddings are not the closest.
+        """
+        if not config.HYBRID_SEARCH or not len(self.keyword_index):
+            return self.vector_store.similarity_search(question, k=k)
         
-        context = "\n\n---\n\n".join(context_parts)
+        fetch_k = max(k, config.HYBRID_FETCH_K)
+        return reciprocal_rank_fusion(
+            [
+                self.vector_store.similarity_search(question, k=fetch_k),
+                self.keyword_index.search(question, k=fetch_k)
+            ],
+            k=k,
+            rrf_k=config.RRF_K
+        )
+    
+    def _format_context(self, docs):
+        """Create a deduplicated, token-budgeted context from retrieved documents"""
+        return build_context(docs, config.CONTEXT_MAX_TOKENS)
+    
+    def _route(self, question):
+        """Answer structured questions directly; returns `(intent, answer)` or None"""
+        if not config.QUERY_ROUTER:
+            return None
+        return self.router.route(question)
+    
+    def _select_chain(self, question):
+        """Use the fast model for short factual questions when one is configured"""
+        if self.fast_chain is not None and self.router.is_simple(question):
+            return self.fast_chain
+        return self.chain
+    
+    def _memory_settings(self):
+        return {
+            "max_turns": config.CONVERSATION_TURNS,
+            "summary_chars": config.CONVERSATION_SUMMARY_CHARS,
+            "turn_chars": config.CONVERSATION_TURN_CHARS
+        }
+    
+    def _conversation(self, session_id, chat_history):
+        """Memory for a session, or a throwaway one built from `chat_history` messages"""
+        if session_id:
+            return self.conversations.get(session_id)
+        if chat_history:
+            return ConversationMemory.from_messages(chat_history, **self._memory_settings())
+        return None
+    
+    def _history(self, memory):
+        """Conversation so far, for the prompt"""
+        return (memory.render() if memory else "") or "None yet"
+    
+    def _needs_rewrite(self, question, memory):
+        return bool(memory) and is_follow_up(question)
+    
+    def _rewritten(self, question, memory, response):
+        """Standalone query from a rewrite response, or a heuristic one if it failed"""
+        query = response.content.strip().strip('"').strip() if response is not None else ""
+        return query or f"{memory.last_question()} {question}"
+    
+    def _standalone_question(self, question, memory):
+        """Rewrite a follow-up into a standalone retrieval query"""
+        if not self._needs_rewrite(question, memory):
+            return question
+        response = None
+        if config.CONVERSATION_REWRITE and self.rewrite_chain is not None:
+            try:
+                response = self.rewrite_chain.invoke({"history": self._history(memory), "question": question})
+            except Exception as e:
+                print(f"⚠️ Follow-up rewrite failed: {e}")
+        return self._rewritten(question, memory, response)
+    
+    async def _astandalone_question(self, question, memory):
+        """Async `_standalone_question`"""
+        if not self._needs_rewrite(question, memory):
+            return question
+        response = None
+        if config.CONVERSATION_REWRITE and self.rewrite_chain is not None:
+            try:
+                response = await self.rewrite_chain.ainvoke({"history": self._history(memory), "question": question})
+            except Exception as e:
+                print(f"⚠️ Follow-up rewrite failed: {e}")
+        return self._rewritten(question, memory, response)
+    
+    def _summarize(self, summary, turns):
+        """Fold turns into a conversation summary with the LLM"""
+        return self.summary_chain.invoke({
+            "summary": summary or "None yet",
+            "turns": format_turns(turns, config.CONVERSATION_TURN_CHARS),
+            "max_chars": config.CONVERSATION_SUMMARY_CHARS
+        }).content
+    
+    def _remember(self, memory, question, answer, session_id):
+        """Record a turn of a session; older turns are summarized in the background
         
-        # System message with instructions
-        system_message = """You are an AI assistant representing Sankalp Singh, an AI Engineer. 
-        You have access to information from:
-        1. GitHub repositories and projects
-        2. Personal information and bio
-        3. Detailed resume including education, work experience, skills, and achievements
+        Memory built from `chat_history` is thrown away after the call, so
+        without a `session_id` nothing is recorded or summarized.
+        """
+        if memory is None or not session_id:
+            return
+        memory.add_turn(question, answer)
+        if memory.claim_fold():
+            self._memory_executor.submit(memory.fold, self._summarize if self.summary_chain else None)
+    
+    def _cacheable(self, query, question, memory):
+        """Whether an answer can be shared through the cache
+        
+        The prompt includes the conversation so far, so only answers to
+        standalone questions asked with no history are stored.
+        """
+        return query == question and not memory
+    
+    def _lookup_answer(self, question, follow_up=False):
+        """Check the answer cache; returns `(answer, embedding, version)`
+        
+        Answers to rewritten follow-ups depend on earlier turns, so only
+        standalone questions are served from the cache.
+        """
+        version = self.kb_version
+        if follow_up:
+            return None, None, version
+        answer, vector = self.answer_cache.lookup(question, version)
+        return answer, vector, version
+    
+    def get_response(self, question, chat_history=None, session_id=None):
+        """Get response from RAG engine
         
-        When answering questions:
-        - Use specific details from the provided context
-        - For resume questions (education, work experience, skills), refer to the RESUME CONTENT sections
-        - Be conversational and helpful
-        - If asked about specific experiences or qualifications, cite them from the resume
-        - If the information isn't in the context, say so politely
+        With a `session_id` the engine remembers the conversation; otherwise
+        `chat_history` messages (`{'role', 'content'}`) give the context.
+        """
+        memory = self._conversation(session_id, chat_history)
+        routed = self._route(question)
+        if routed is not None:
+            self._remember(memory, question, routed[1], session_id)
+            return routed[1]
         
-        Context from knowledge base:
-        {context}
+        not_ready = self._not_ready_message()
+        if not_ready:
+            return not_ready
         
-        Answer the following question based on the context above:"""
+        query = self._standalone_question(question, memory)
+        cached, vector, version = self._lookup_answer(query, query != question)
+        if cached is not None:
+            self._remember(memory, question, cached, session_id)
+            return cached
         
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_message),
-            ("human", "{question}")
-        ])
+        # Retrieve relevant documents - increased from 3 to 5 for better resume coverage
+        docs = self._retrieve(query)
         
         # Generate response
-        chain = prompt | self.llm
-        response = chain.invoke({
-            "context": context,
+        response = self._select_chain(query).invoke({
+            "context": self._format_context(docs),
+            "history": self._history(memory),
             "question": question
         })
         
+        if self._cacheable(query, question, memory) and response.content.strip():
+            self.answer_cache.store(question, response.content, version, vector)
+        self._remember(memory, question, response.content, session_id)
         return response.content
     
-    def stream_response(self, question):
-        """Stream response from the chatbot"""
-        if not self.is_initialized:
-            yield "Please wait while I initialize my knowledge base..."
-            return
+    async def aget_response(self, question, chat_history=None, session_id=None):
+        """Get response from RAG engine without blocking the event loop
+        
+        Embedding and vector search run on the bounded retrieval executor;
+        the LLM call uses the chain's native async path.
+        """
+        memory = self._conversation(session_id, chat_history)
+        routed = self._route(question)
+        if routed is not None:
+            self._remember(memory, question, routed[1], session_id)
+            return routed[1]
+        
+        not_ready = self._not_ready_message()
+        if not_ready:
+            return not_ready
         
-        # Retrieve relevant documents
-        docs = self.vector_store.similarity_search(question, k=3)
-        context = "\n\n".join([doc.page_content for doc in docs])
+        query = await self._astandalone_question(question, memory)
+        loop = asyncio.get_running_loop()
+        cached, vector, version = await loop.run_in_executor(
+            self._executor, self._lookup_answer, query, query != question
+        )
+        if cached is not None:
+            self._remember(memory, question, cached, session_id)
+            return cached
         
-        # Create prompt
-        system_message = f"""You are an AI assistant for Sankalp Singh's portfolio. 
-        You help visitors learn about Sankalp's projects, skills, and experience.
-        Be friendly, professional, and informative. Use the provided context to answer questions.
+        docs = await loop.run_in_executor(self._executor, self._retrieve, query)
         
-        Context:
-        {context}
+        response = await self._select_chain(query).ainvoke({
+            "context": self._format_context(docs),
+            "history": self._history(memory),
+            "question": question
+        })
+        
+        if self._cacheable(query, question, memory) and response.content.strip():
+            self.answer_cache.store(question, response.content, version, vector)
+        self._remember(memory, question, response.content, session_id)
+        return response.content
+    
+    async def astream_events(self, question, chat_history=None, session_id=None):
+        """Stream an answer as `(event, data)` pairs
+        
+        Emits one `sources` event with the retrieved chunks' metadata, a
+        `token` event per LLM chunk as it arrives, and a final `done` event
+        with timing stats (and the rewritten `query` for follow-ups).
         """
+        started = time.perf_counter()
+        memory = self._conversation(session_id, chat_history)
+        routed = self._route(question)
+        if routed is not None:
+            intent, answer = routed
+            self._remember(memory, question, answer, session_id)
+            yield "sources", {"sources": []}
+            yield "token", {"text": answer}
+            yield "done", {
+                "cached": False,
+                "routed": intent,
+                "total_ms": round((time.perf_counter() - started) * 1000, 1)
+            }
+            return
         
-        messages = [
-            SystemMessage(content=system_message),
-            HumanMessage(content=question)
-        ]
+        not_ready = self._not_ready_message()
+        if not_ready:
+            yield "token", {"text": not_ready}
+            yield "done", {"total_ms": 0}
+            return
+        
+        query = await self._astandalone_question(question, memory)
+        loop = asyncio.get_running_loop()
+        cached, vector, version = await loop.run_in_executor(
+            self._executor, self._lookup_answer, query, query != question
+        )
+        if cached is not None:
+            self._remember(memory, question, cached, session_id)
+            yield "sources", {"sources": []}
+            yield "token", {"text": cached}
+            yield "done", {
+                "cached": True,
+                "total_ms": round((time.perf_counter() - started) * 1000, 1)
+            }
+            return
+        
+        docs = await loop.run_in_executor(self._executor, self._retrieve, query)
+        retrieved = time.perf_counter()
+        yield "sources", {
+            "sources": [
+                {
+                    "type": doc.metadata.get('type', 'unknown'),
+                    "name": doc.metadata.get('name'),
+                    "url": doc.metadata.get('url'),
+                    "source": doc.metadata.get('source')
+                }
+                for doc in docs
+            ]
+        }
+        
+        first_token = None
+        chunks = []
+        async for chunk in self._select_chain(query).astream({
+            "context": self._format_context(docs),
+            "history": self._history(memory),
+            "question": question
+        }):
+            if not chunk.content:
+                continue
+            if first_token is None:
+                first_token = time.perf_counter()
+            chunks.append(chunk.content)
+            yield "token", {"text": chunk.content}
+        
+        # Only reached when the stream completed; an empty answer is not worth keeping
+        answer = "".join(chunks)
+        if answer.strip():
+            if self._cacheable(query, question, memory):
+                self.answer_cache.store(question, answer, version, vector)
+            self._remember(memory, question, answer, session_id)
         
-        # Stream response
-        for chunk in self.llm.stream(messages):
-            yield chunk.content
+        finished = time.perf_counter()
+        yield "done", {
+            "cached": False,
+            "query": query if query != question else None,
+            "retrieval_ms": round((retrieved - started) * 1000, 1),
+            "first_token_ms": round((first_token - started) * 1000, 1) if first_token else None,
+            "total_ms": round((finished - started) * 1000, 1),
+            "chunks": len(chunks)
+        }
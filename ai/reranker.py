@@ -0,0 +1,107 @@
+"""
+Cross-encoder reranking with a latency budget and adaptive k
+"""
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import config
+from ai.llm_router import LatencyTracker
+
+_models: Dict[Tuple[str, int], object] = {}
+_models_lock = threading.Lock()
+
+def load_cross_encoder(model_name: str, max_length: int = 256, device: str = "cpu"):
+    """Cross-encoder model, loaded once per process and shared between engines"""
+    key = (model_name, max_length)
+    with _models_lock:
+        if key not in _models:
+            # Deferred: importing sentence-transformers loads torch
+            from sentence_transformers import CrossEncoder
+            _models[key] = CrossEncoder(model_name, device=device, max_length=max_length)
+        return _models[key]
+
+class CrossEncoderReranker:
+    """Second retrieval stage: rescore first-stage candidates with a cross-encoder
+
+    - Candidates are scored in batches of `batch_size` (query, chunk) pairs.
+    - Scoring stops before a batch that would overrun `time_budget` seconds,
+      estimated from the previous batch; unscored candidates keep their
+      first-stage order after the scored ones.
+    - Scores are squashed to 0-1 with a sigmoid. `select` keeps candidates
+      scoring at least `threshold`, but never fewer than `min_k` or more
+      than `max_k`.
+    """
+
+    def __init__(self, model_name: str, batch_size: int = 16, time_budget: float = 0.25,
+                 threshold: float = 0.1, min_k: int = 2, max_k: int = 5, max_length: int = 256):
+        self.model_name = model_name
+        self.batch_size = max(1, batch_size)
+        self.time_budget = time_budget
+        self.threshold = threshold
+        self.min_k = min_k
+        self.max_k = max_k
+        self.model = load_cross_encoder(model_name, max_length)
+        self.latency = LatencyTracker()
+        self.truncated = 0
+
+    def rerank(self, query: str, docs: List) -> List[Tuple[object, Optional[float]]]:
+        """`(doc, score)` pairs, best first; `score` is None for candidates left unscored"""
+        started = time.perf_counter()
+        scores: List[float] = []
+        batch_seconds = 0.0
+        for start in range(0, len(docs), self.batch_size):
+            elapsed = time.perf_counter() - started
+            if scores and elapsed + batch_seconds > self.time_budget:
+                self.truncated += 1
+                break
+            batch = docs[start:start + self.batch_size]
+            batch_started = time.perf_counter()
+            logits = self.model.predict(
+                [(query, doc.page_content) for doc in batch],
+                batch_size=self.batch_size,
+                show_progress_bar=False
+            )
+            batch_seconds = time.perf_counter() - batch_started
+            scores.extend((1 / (1 + np.exp(-np.asarray(logits, dtype=np.float64)))).tolist())
+        self.latency.record(time.perf_counter() - started)
+
+        scored = sorted(zip(docs, scores), key=lambda pair: pair[1], reverse=True)
+        return scored + [(doc, None) for doc in docs[len(scores):]]
+
+    def select(self, query: str, docs: List, max_k: Optional[int] = None) -> List:
+        """Rerank candidates and keep an adaptive number of them"""
+        max_k = min(max_k or self.max_k, self.max_k)
+        if not docs:
+            return []
+        selected = []
+        for doc, score in self.rerank(query, docs):
+            if len(selected) >= max_k:
+                break
+            if len(selected) >= self.min_k and (score is None or score < self.threshold):
+                break
+            selected.append(doc)
+        return selected
+
+    def stats(self) -> Dict:
+        """Reranking latency and budget overruns, for diagnostics"""
+        return {
+            "model": self.model_name,
+            "calls": len(self.latency),
+            "p50": self.latency.percentile(50),
+            "p95": self.latency.percentile(95),
+            "truncated": self.truncated
+        }
+
+def create_reranker() -> Optional[CrossEncoderReranker]:
+    """Reranker configured from `config`, or None when reranking is disabled"""
+    if not config.RERANKER_ENABLED:
+        return None
+    return CrossEncoderReranker(
+        config.RERANKER_MODEL,
+        batch_size=config.RERANK_BATCH_SIZE,
+        time_budget=config.RERANK_TIME_BUDGET_MS / 1000,
+        threshold=config.RERANK_THRESHOLD,
+        min_k=config.RERANK_MIN_K,
+        max_k=config.RETRIEVAL_K
+    )
@@ -0,0 +1,156 @@
+"""
+Resume ingestion: cached PDF text extraction and section-typed documents
+"""
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+from langchain_core.documents import Document
+
+RESUME_FEATURED_PROJECTS = """KEY RESUME PROJECTS (Featured):
+- StudyBuddy: AI-powered study companion application
+- PromptBoost: Advanced prompt engineering tool
+- AgenticQA: Intelligent question-answering system using agentic AI
+
+These are the main projects highlighted in Sankalp Singh's resume.
+When asked about resume projects, refer to these three featured projects."""
+
+# Heading text (lowercase, no spaces) -> section name
+SECTION_HEADINGS = {
+    "summary": "summary",
+    "profile": "summary",
+    "objective": "summary",
+    "about": "summary",
+    "skills": "skills",
+    "technicalskills": "skills",
+    "experience": "experience",
+    "workexperience": "experience",
+    "professionalexperience": "experience",
+    "internships": "experience",
+    "education": "education",
+    "projects": "projects",
+    "personalprojects": "projects",
+    "achievements": "achievements",
+    "awards": "achievements",
+    "certifications": "achievements",
+    "leadership": "leadership",
+    "activities": "leadership",
+    "extracurricularactivities": "leadership",
+    "publications": "publications",
+}
+
+SECTION_TITLES = {
+    "contact": "CONTACT",
+    "summary": "SUMMARY",
+    "skills": "SKILLS",
+    "experience": "WORK EXPERIENCE",
+    "education": "EDUCATION",
+    "projects": "PROJECTS",
+    "achievements": "ACHIEVEMENTS",
+    "leadership": "LEADERSHIP",
+    "publications": "PUBLICATIONS",
+}
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _extract_pdf_text(path: str) -> str:
+    import PyPDF2
+    with open(path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+def extract_resume_text(path: str, cache_path: Optional[str] = None) -> str:
+    """Text of a PDF resume, cached on disk
+
+    A cache entry is reused while the file's mtime and size are unchanged;
+    if only the mtime moved, the SHA-256 decides whether to parse again.
+    """
+    stat = os.stat(path)
+    cached = None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = None
+    if cached and cached.get("path") != os.path.abspath(path):
+        cached = None
+
+    if cached and cached.get("mtime") == stat.st_mtime and cached.get("size") == stat.st_size:
+        return cached["text"]
+
+    sha256 = _file_hash(path)
+    if cached and cached.get("sha256") == sha256:
+        text = cached["text"]
+    else:
+        text = _extract_pdf_text(path)
+        print(f"📄 Parsed resume {os.path.basename(path)}")
+
+    if cache_path:
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "path": os.path.abspath(path),
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+                "sha256": sha256,
+                "text": text
+            }, f)
+        os.replace(tmp_path, cache_path)
+    return text
+
+def _heading_section(line: str) -> Optional[str]:
+    """Section name if a line is a known heading such as "Work Experience:" """
+    key = re.sub(r"[^a-z]", "", line.lower())
+    if len(line) > 40 or not key:
+        return None
+    return SECTION_HEADINGS.get(key)
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """Split resume text into `(section, body)` pairs in document order
+
+    Lines before the first heading (name, phone, links) form the
+    `contact` section. A section that appears twice is merged.
+    """
+    sections: Dict[str, List[str]] = {}
+    current = "contact"
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        section = _heading_section(line)
+        if section:
+            current = section
+            sections.setdefault(current, [])
+            continue
+        sections.setdefault(current, []).append(line)
+    return [(section, "\n".join(lines)) for section, lines in sections.items() if lines]
+
+def build_resume_documents(path: str, cache_path: Optional[str] = None) -> List[Document]:
+    """One document per resume section, plus the featured-projects note
+
+    Each document carries `type="resume"` and the section as `name` and
+    `section`, so retrieval, keyword search and the context builder treat
+    sections as separate sources.
+    """
+    text = extract_resume_text(path, cache_path)
+    source = os.path.basename(path)
+    documents = [
+        Document(
+            page_content=f"RESUME CONTENT - {SECTION_TITLES.get(section, section.upper())}:\n{body}",
+            metadata={"type": "resume", "name": section, "section": section, "source": source}
+        )
+        for section, body in split_sections(text)
+    ]
+    documents.append(Document(
+        page_content=RESUME_FEATURED_PROJECTS,
+        metadata={"type": "resume", "name": "featured_projects", "section": "projects", "source": source}
+    ))
+    return documents
@@ -0,0 +1,209 @@
+"""
+Document sources for the knowledge base
+
+Each source is an iterable of LangChain documents produced lazily, so the
+engine can split and embed them in batches as they arrive instead of
+building every document in memory first.
+"""
+import glob
+import os
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from langchain_core.documents import Document
+import config
+from ai.resume import build_resume_documents
+
+# Source types rebuilt from local files on every refresh (repositories are diffed instead)
+LOCAL_SOURCE_TYPES = ("personal_info", "resume", "markdown")
+# Source types chunked along their Markdown structure
+MARKDOWN_SOURCE_TYPES = ("readme", "markdown")
+
+def build_repo_document(repo: Dict) -> Document:
+    """Basic metadata document for a repository"""
+    content = "\n".join([
+        f"Project: {repo.get('name', '')}",
+        f"Description: {repo.get('description', 'No description')}",
+        f"Language: {repo.get('language', 'N/A')}",
+        f"Stars: {repo.get('stargazers_count', 0)}",
+        f"Forks: {repo.get('forks_count', 0)}",
+        f"Topics: {', '.join(repo.get('topics', []))}",
+        f"Created: {repo.get('created_at', '')[:10]}",
+        f"Updated: {repo.get('updated_at', '')[:10]}",
+        f"URL: {repo.get('html_url', '')}"
+    ])
+
+    return Document(
+        page_content=content,
+        metadata={
+            "name": repo.get('name', ''),
+            "url": repo.get('html_url', ''),
+            "language": repo.get('language', ''),
+            "type": "repo_metadata"
+        }
+    )
+
+def build_readme_document(repo: Dict, readme: str) -> Document:
+    """README document for a repository, split by `MarkdownSplitter` under its `title`"""
+    return Document(
+        page_content=f"Project URL: {repo.get('html_url', '')}\n\n{readme.strip()}",
+        metadata={
+            "name": repo.get('name', ''),
+            "url": repo.get('html_url', ''),
+            "type": "readme",
+            "title": f"PROJECT README - {repo.get('name', '')}",
+            "source": f"{repo.get('name', '')}/README.md"
+        }
+    )
+
+class DocumentSource:
+    """A named, lazily evaluated stream of knowledge-base documents"""
+
+    name = "source"
+
+    def __iter__(self) -> Iterator[Document]:
+        raise NotImplementedError
+
+class RepositorySource(DocumentSource):
+    """One metadata document per GitHub repository"""
+
+    name = "repositories"
+
+    def __init__(self, repos: List[Dict]):
+        self.repos = repos
+
+    def __iter__(self):
+        for repo in self.repos:
+            yield build_repo_document(repo)
+
+class ReadmeSource(DocumentSource):
+    """README documents, fetched from GitHub a batch of repositories at a time
+
+    - `on_fetched(repo, readme)` is called for every repository whose README
+      was fetched, with the README info dict (`content`, `sha`) or None
+      when it has none, so callers can record README SHAs while the
+      documents stream.
+    - `on_failed(repo)` is called for repositories whose fetch failed; no
+      document is yielded for them.
+    - READMEs whose SHA matches `known_shas[name]` are not yielded again.
+    """
+
+    name = "readmes"
+
+    def __init__(self, repos: List[Dict], github_api, batch_size: int = 8,
+                 on_fetched: Optional[Callable[[Dict, Optional[Dict]], None]] = None,
+                 on_failed: Optional[Callable[[Dict], None]] = None,
+                 known_shas: Optional[Dict[str, str]] = None):
+        self.repos = repos
+        self.github_api = github_api
+        self.batch_size = max(1, batch_size)
+        self.on_fetched = on_fetched
+        self.on_failed = on_failed
+        self.known_shas = known_shas or {}
+
+    def __iter__(self):
+        if not self.github_api:
+            return
+        for start in range(0, len(self.repos), self.batch_size):
+            batch = self.repos[start:start + self.batch_size]
+            readmes = self.github_api.get_readmes([repo.get('name', '') for repo in batch])
+            for repo in batch:
+                name = repo.get('name', '')
+                if name not in readmes:
+                    if self.on_failed:
+                        self.on_failed(repo)
+                    continue
+                readme = readmes[name]
+                if self.on_fetched:
+                    self.on_fetched(repo, readme)
+                if readme and not (readme.get('sha') and readme['sha'] == self.known_shas.get(name)):
+                    yield build_readme_document(repo, readme['content'])
+
+class ProfileSource(DocumentSource):
+    """Personal information and skills from `config`"""
+
+    name = "profile"
+
+    def __iter__(self):
+        yield Document(
+            page_content="\n".join([
+                f"Name: {config.PERSONAL_INFO['name']}",
+                f"Title: {config.PERSONAL_INFO['title']}",
+                f"Bio: {' '.join(config.PERSONAL_INFO['bio'].split())}",
+                f"Skills: {', '.join([skill for skills in config.SKILLS.values() for skill in skills])}",
+                "",
+                "I am an AI Engineer specializing in Machine Learning, Deep Learning, Gen AI, and Agentic AI.",
+                "I have experience with Python, TensorFlow, PyTorch, LangChain, FastAPI, and React.",
+                "I build intelligent systems and transform complex problems into elegant solutions."
+            ]),
+            metadata={"type": "personal_info"}
+        )
+
+class ResumeSource(DocumentSource):
+    """Resume sections from the PDF; a missing or unreadable resume yields nothing"""
+
+    name = "resume"
+
+    def __init__(self, path: str, cache_path: Optional[str] = None):
+        self.path = path
+        self.cache_path = cache_path
+
+    def __iter__(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            documents = build_resume_documents(self.path, self.cache_path)
+        except Exception as e:
+            print(f"⚠️ Could not load resume: {e}")
+            return
+        print(f"✅ Added {len(documents)} resume sections to knowledge base")
+        yield from documents
+
+class MarkdownFolderSource(DocumentSource):
+    """Every Markdown file under a local folder, one document per file
+
+    Files are read one at a time as the stream is consumed. Documents are
+    named `<folder name>/<relative path>`, so moving the folder does not
+    re-embed its files.
+    """
+
+    name = "markdown"
+
+    def __init__(self, directory: str, pattern: str = "**/*.md"):
+        self.directory = directory
+        self.pattern = pattern
+
+    def __iter__(self):
+        if not os.path.isdir(self.directory):
+            print(f"⚠️ Markdown folder not found: {self.directory}")
+            return
+        label = os.path.basename(os.path.normpath(self.directory))
+        for path in sorted(glob.glob(os.path.join(self.directory, self.pattern), recursive=True)):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    text = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"⚠️ Could not read {path}: {e}")
+                continue
+            if not text.strip():
+                continue
+            relative = os.path.relpath(path, self.directory).replace(os.sep, "/")
+            yield Document(
+                page_content=text.strip(),
+                metadata={
+                    "type": "markdown",
+                    "name": f"{label}/{relative}",
+                    "title": f"NOTES - {label}/{relative}",
+                    "source": relative
+                }
+            )
+
+def local_sources() -> List[DocumentSource]:
+    """Sources read from config and local files: profile, resume and Markdown folders"""
+    sources = [ProfileSource(), ResumeSource(config.RESUME_PATH, config.RESUME_CACHE_PATH)]
+    for directory in config.KB_MARKDOWN_DIRS:
+        sources.append(MarkdownFolderSource(directory))
+    return sources
+
+def stream_documents(sources: Iterable[DocumentSource]) -> Iterator[Document]:
+    """Chain sources into one document stream, in order"""
+    for source in sources:
+        yield from source
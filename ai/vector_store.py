@@ -0,0 +1,207 @@
+"""
+Vector-store backends for the knowledge base
+"""
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from langchain_core.documents import Document
+import config
+
+class NumpyVectorStore:
+    """In-process vector index over a contiguous float32 matrix
+
+    Embeddings are unit-length, so top-k is one matrix-vector product plus
+    `argpartition`. The matrix is persisted as `.npy` and memory-mapped on
+    load; chunk texts and metadata live in a JSON file next to it.
+
+    Adds and deletes only change the in-memory index; `flush()` writes
+    both files (each to a temp file, then `os.replace`) once per batch of
+    changes, so a sync rewrites the matrix once instead of once per call.
+
+    Implements the subset of the LangChain Chroma API that RAGEngine uses.
+    Scores from `similarity_search_with_score` are cosine similarities
+    (higher is better), not distances.
+    """
+
+    VECTORS_FILE = "vectors.npy"
+    CHUNKS_FILE = "chunks.json"
+
+    def __init__(self, embedding_function, persist_directory: Optional[str] = None,
+                 read_only: bool = False):
+        self.embedding_function = embedding_function
+        self.persist_directory = persist_directory
+        self.read_only = read_only
+        self._lock = threading.Lock()
+        # (ids, documents, vectors) is swapped as a whole so readers never see a torn state
+        self._state = ([], [], None)
+        self._columns = {}
+        self._dirty = False
+        if persist_directory:
+            self._load()
+
+    def _paths(self) -> Tuple[str, str]:
+        return (
+            os.path.join(self.persist_directory, self.VECTORS_FILE),
+            os.path.join(self.persist_directory, self.CHUNKS_FILE)
+        )
+
+    def _load(self):
+        """Memory-map persisted vectors and load chunk texts and metadata"""
+        vectors_path, chunks_path = self._paths()
+        if not (os.path.exists(vectors_path) and os.path.exists(chunks_path)):
+            return
+        with open(chunks_path, "r", encoding="utf-8") as f:
+            chunks = json.load(f)
+        vectors = np.load(vectors_path, mmap_mode="r")
+        if vectors.shape[0] != len(chunks):
+            # The two files are replaced one after the other; a crash in between leaves them out of step
+            print(f"⚠️ {vectors_path} has {vectors.shape[0]} rows for {len(chunks)} chunks, ignoring the stored index")
+            return
+        ids = [chunk["id"] for chunk in chunks]
+        documents = [
+            Document(page_content=chunk["text"], metadata=chunk["metadata"])
+            for chunk in chunks
+        ]
+        self._set_state(ids, documents, vectors)
+
+    def flush(self):
+        """Persist changes made since the last flush; a no-op when there are none"""
+        with self._lock:
+            if self._dirty:
+                self._persist()
+                self._dirty = False
+
+    def _persist(self):
+        """Atomically write vectors and chunks to the persist directory"""
+        if not self.persist_directory:
+            return
+        if self.read_only:
+            raise RuntimeError("Vector store was opened read-only")
+        os.makedirs(self.persist_directory, exist_ok=True)
+        ids, documents, vectors = self._state
+        vectors_path, chunks_path = self._paths()
+
+        with open(f"{vectors_path}.tmp", "wb") as f:
+            np.save(f, vectors if vectors is not None else np.empty((0, 0), dtype=np.float32))
+        os.replace(f"{vectors_path}.tmp", vectors_path)
+
+        chunks = [
+            {"id": chunk_id, "text": doc.page_content, "metadata": doc.metadata}
+            for chunk_id, doc in zip(ids, documents)
+        ]
+        with open(f"{chunks_path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(chunks, f)
+        os.replace(f"{chunks_path}.tmp", chunks_path)
+
+    def _set_state(self, ids, documents, vectors):
+        self._state = (ids, documents, vectors)
+        self._columns = {}
+
+    def _embed_documents(self, texts: List[str]) -> np.ndarray:
+        if hasattr(self.embedding_function, "encode"):
+            return self.embedding_function.encode(texts)
+        vectors = np.asarray(self.embedding_function.embed_documents(texts), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def _embed_query(self, query: str) -> np.ndarray:
+        if hasattr(self.embedding_function, "embed_query_array"):
+            return self.embedding_function.embed_query_array(query)
+        vector = np.asarray(self.embedding_function.embed_query(query), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def add_documents(self, documents: List[Document], ids: List[str]) -> List[str]:
+        """Embed and append documents under the given ids; persisted on `flush()`"""
+        new_vectors = self._embed_documents([doc.page_content for doc in documents])
+        with self._lock:
+            old_ids, old_documents, old_vectors = self._state
+            vectors = new_vectors if old_vectors is None or not len(old_ids) \
+                else np.vstack([old_vectors, new_vectors])
+            self._set_state(
+                old_ids + list(ids),
+                old_documents + list(documents),
+                np.ascontiguousarray(vectors, dtype=np.float32)
+            )
+            self._dirty = True
+        return list(ids)
+
+    def delete(self, ids: List[str]):
+        """Remove documents by id; persisted on `flush()`"""
+        removed = set(ids)
+        with self._lock:
+            old_ids, old_documents, old_vectors = self._state
+            keep = [i for i, chunk_id in enumerate(old_ids) if chunk_id not in removed]
+            self._set_state(
+                [old_ids[i] for i in keep],
+                [old_documents[i] for i in keep],
+                np.ascontiguousarray(old_vectors[keep]) if old_vectors is not None else None
+            )
+            self._dirty = True
+
+    def delete_collection(self):
+        """Drop every document and the persisted files"""
+        with self._lock:
+            self._set_state([], [], None)
+            self._dirty = False
+            if self.persist_directory and not self.read_only:
+                for path in self._paths():
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def get(self, include: Optional[List[str]] = None) -> Dict:
+        """Chroma-style dump of ids, texts and metadata"""
+        ids, documents, _ = self._state
+        return {
+            "ids": list(ids),
+            "documents": [doc.page_content for doc in documents],
+            "metadatas": [doc.metadata for doc in documents]
+        }
+
+    def _filter_mask(self, filter: Dict, documents: List[Document]) -> np.ndarray:
+        """Boolean row mask for equality filters on metadata, e.g. {"type": "readme"}"""
+        columns = self._columns
+        mask = np.ones(len(documents), dtype=bool)
+        for key, expected in filter.items():
+            if key not in columns:
+                columns[key] = np.array([doc.metadata.get(key) for doc in documents], dtype=object)
+            if isinstance(expected, dict) and "$in" in expected:
+                mask &= np.isin(columns[key], list(expected["$in"]))
+            else:
+                mask &= columns[key] == expected
+        return mask
+
+    def similarity_search_with_score(self, query: str, k: int = 4,
+                                     filter: Optional[Dict] = None) -> List[Tuple[Document, float]]:
+        """Top-k documents by cosine similarity, optionally filtered on metadata"""
+        ids, documents, vectors = self._state
+        if vectors is None or not len(ids):
+            return []
+
+        scores = vectors @ self._embed_query(query)
+        if filter:
+            scores = np.where(self._filter_mask(filter, documents), scores, -np.inf)
+
+        k = min(k, len(ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(documents[i], float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+    def similarity_search(self, query: str, k: int = 4,
+                          filter: Optional[Dict] = None) -> List[Document]:
+        """Top-k documents by cosine similarity"""
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, filter)]
+
+def create_vector_store(embeddings, persist_directory: str, backend: Optional[str] = None):
+    """Open the vector store selected by `config.VECTOR_BACKEND` ("chroma" or "numpy")"""
+    backend = backend or config.VECTOR_BACKEND
+    if backend == "numpy":
+        return NumpyVectorStore(embeddings, persist_directory)
+
+    from langchain_community.vectorstores import Chroma
+    return Chroma(
+        persist_directory=persist_directory,
+        embedding_function=embeddings
+    )
@@ -10,6 +10,8 @@ from components.projects import render_projects
 from components.github_stats import render_github_stats
 from components.chatbot import render_chatbot
 from components.contact import render_contact
+from utils.refresher import BackgroundRefresher
+from ai.engine_manager import get_engine_manager
 
 # Page configuration
 st.set_page_config(
@@ -30,6 +32,13 @@ try:
 except:
     st.warning("Custom CSS file not found. Using default styling.")
 
+@st.cache_resource(show_spinner=False)
+def start_background_refresher():
+    """Keep GitHub data and the chatbot's index warm for every session served by this process"""
+    refresher = BackgroundRefresher(callbacks=[get_engine_manager().refresh_index])
+    refresher.start(run_immediately=True)
+    return refresher
+
 # Navigation
 def render_navigation():
     """Render navigation menu"""
@@ -49,6 +58,8 @@ def render_navigation():
 def main():
     """Main application"""
     
+    start_background_refresher()
+    
     # Render navigation
     render_navigation()
     
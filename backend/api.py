@@ -10,12 +10,19 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import Optional, List
+import json
 import uvicorn
 
-from ai.rag_engine import RAGEngine
-from utils.github_api import GitHubAPI
+import config
+from ai.engine_manager import get_engine_manager
+from utils.github_api import create_github_api
+from utils.rate_limiter import PRIORITY_BACKGROUND
+from utils.refresher import BackgroundRefresher
+from utils.concurrency import ConcurrencyLimiter, CapacityExceeded
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -34,12 +41,20 @@ app.add_middleware(
 )
 
 # Global instances
-rag_engine: Optional[RAGEngine] = None
-is_initialized = False
+engine_manager = get_engine_manager()
+refresher: Optional[BackgroundRefresher] = None
+
+# Bounded chat concurrency: excess requests get a 429 instead of piling up
+chat_limiter = ConcurrencyLimiter(
+    max_concurrent=config.CHAT_MAX_CONCURRENCY,
+    max_queue=config.CHAT_MAX_QUEUE,
+    queue_timeout=config.CHAT_QUEUE_TIMEOUT
+)
 
 # Request/Response models
 class ChatRequest(BaseModel):
     message: str
+    session_id: Optional[str] = None  # Conversation to continue; omit for a one-off question
     
 class ChatResponse(BaseModel):
     response: str
@@ -49,45 +64,36 @@ class ChatResponse(BaseModel):
 class StatusResponse(BaseModel):
     initialized: bool
     message: str
+    stage: Optional[str] = None
+    progress: Optional[float] = None
+    error: Optional[str] = None
 
-# Initialize RAG engine on startup
+# Start building the RAG engine on startup without blocking it
 @app.on_event("startup")
 async def startup_event():
-    """Initialize the RAG engine with knowledge base"""
-    global rag_engine, is_initialized
+    """Start loading the RAG engine and knowledge base in the background"""
+    global refresher
     
-    try:
-        print("🚀 Initializing RAG Engine...")
-        rag_engine = RAGEngine(use_groq=True)
-        
-        # Try to load GitHub repositories for knowledge base
-        try:
-            print("📚 Loading GitHub repositories...")
-            github = GitHubAPI()
-            repos = github.get_repositories()
-            
-            if repos:
-                print(f"📖 Fetching READMEs for {len(repos)} repositories...")
-                rag_engine.initialize_knowledge_base(repos, github_api=github)
-                print(f"✅ Knowledge base initialized with {len(repos)} repositories")
-            else:
-                print("⚠️ No repositories found, initializing with personal info only...")
-                rag_engine.initialize_knowledge_base()
-        except Exception as github_error:
-            print(f"⚠️ GitHub loading failed: {github_error}")
-            print("Initializing with personal info only...")
-            rag_engine.initialize_knowledge_base()
-        
-        is_initialized = True
-        print("✅ RAG Engine ready!")
-            
-    except Exception as e:
-        print(f"❌ Error initializing RAG engine: {e}")
-        print(f"Error type: {type(e).__name__}")
-        import traceback
-        traceback.print_exc()
-        # Don't fail startup, but mark as not initialized
-        is_initialized = False
+    # Keep GitHub data and the knowledge base warm off the request path
+    refresher = BackgroundRefresher(callbacks=[engine_manager.refresh_index])
+    refresher.start()
+    
+    # The API serves requests at once; /api/chat/status reports progress
+    engine_manager.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the background refresher"""
+    if refresher is not None:
+        refresher.stop()
+
+def not_ready_error():
+    """503 for questions that need the engine while it is still loading"""
+    return HTTPException(
+        status_code=503,
+        detail=engine_manager.not_ready_message(),
+        headers={"Retry-After": "5"}
+    )
 
 @app.get("/")
 async def root():
@@ -101,31 +107,68 @@ async def root():
 @app.get("/api/chat/status", response_model=StatusResponse)
 async def get_status():
     """Check if the chatbot is initialized and ready"""
+    status = engine_manager.status()
     return StatusResponse(
-        initialized=is_initialized,
-        message="Chatbot is ready" if is_initialized else "Chatbot is initializing..."
+        initialized=status["ready"],
+        message=status["message"],
+        stage=status["stage"],
+        progress=status["progress"],
+        error=status["error"]
     )
 
+@app.get("/api/chat/providers")
+async def get_providers():
+    """Rolling latency and error statistics for each LLM provider and the reranker"""
+    engine = engine_manager.engine
+    if engine is None:
+        return {"providers": [], "reranker": None}
+    return {
+        "providers": engine.chain.stats(),
+        "reranker": engine.reranker.stats() if engine.reranker else None
+    }
+
+@app.get("/api/chat/diagnostics")
+async def get_diagnostics():
+    """Load, cache and background-refresh statistics for this worker"""
+    engine = engine_manager.engine
+    github = refresher.github if refresher is not None else create_github_api()
+    return {
+        "concurrency": chat_limiter.status(),
+        "answer_cache": engine.answer_cache.stats() if engine else None,
+        "query_embeddings": engine.embeddings.cache_info() if engine else None,
+        "refresher": refresher.status() if refresher is not None else None,
+        "github_rate_limit": github.get_rate_limit_status()
+    }
+
 @app.post("/api/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """
     Send a message to the AI chatbot and get a response
     """
-    if not is_initialized or rag_engine is None:
-        raise HTTPException(
-            status_code=503,
-            detail="Chatbot is still initializing. Please try again in a moment."
-        )
+    engine = engine_manager.engine
+    if engine is None:
+        # Structured questions can be answered while the engine loads
+        routed = engine_manager.route(request.message)
+        if routed is None:
+            raise not_ready_error()
+        return ChatResponse(response=routed, success=True)
     
     try:
         # Get response from RAG engine
-        response = rag_engine.get_response(request.message)
+        async with chat_limiter.slot():
+            response = await engine.aget_response(request.message, session_id=request.session_id)
         
         return ChatResponse(
             response=response,
             success=True
         )
         
+    except CapacityExceeded:
+        raise HTTPException(
+            status_code=429,
+            detail="The chatbot is busy right now. Please try again in a moment.",
+            headers={"Retry-After": "2"}
+        )
     except Exception as e:
         print(f"❌ Error generating response: {e}")
         return ChatResponse(
@@ -134,26 +177,112 @@ async def chat(request: ChatRequest):
             error=f"Failed to generate response: {str(e)}"
         )
 
+@app.post("/api/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Stream the chatbot's answer as Server-Sent Events
+    
+    Events: `sources` (retrieved chunk metadata), `token` (answer text as it
+    is generated), `done` (timing stats) or `error`.
+    """
+    engine = engine_manager.engine
+    if engine is None:
+        routed = engine_manager.route(request.message)
+        if routed is None:
+            raise not_ready_error()
+        
+        async def routed_stream():
+            yield f"event: sources\ndata: {json.dumps({'sources': []})}\n\n"
+            yield f"event: token\ndata: {json.dumps({'text': routed})}\n\n"
+            yield f"event: done\ndata: {json.dumps({'cached': False, 'routed': True})}\n\n"
+        
+        return StreamingResponse(
+            routed_stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
+    # Check capacity before the response starts so saturation is still a clean 429
+    if not chat_limiter.has_capacity():
+        raise HTTPException(
+            status_code=429,
+            detail="The chatbot is busy right now. Please try again in a moment.",
+            headers={"Retry-After": "2"}
+        )
+    
+    async def event_stream():
+        # The slot is taken inside the generator, so a response that never
+        # starts streaming (client gone) never holds one
+        try:
+            await chat_limiter.acquire()
+        except CapacityExceeded:
+            error = {"error": "The chatbot is busy right now. Please try again in a moment."}
+            yield f"event: error\ndata: {json.dumps(error)}\n\n"
+            return
+        try:
+            async for event, data in engine.astream_events(request.message, session_id=request.session_id):
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        except Exception as e:
+            print(f"❌ Error streaming response: {e}")
+            error = {"error": f"Failed to generate response: {str(e)}"}
+            yield f"event: error\ndata: {json.dumps(error)}\n\n"
+        finally:
+            chat_limiter.release()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/api/chat/initialize")
 async def initialize():
     """
-    Manually trigger knowledge base initialization
+    Start (or retry) knowledge base initialization in the background
     """
-    global rag_engine, is_initialized
+    if engine_manager.is_ready:
+        return {"message": "Chatbot is already initialized", "success": True}
     
-    try:
-        if not rag_engine:
-            rag_engine = RAGEngine(use_groq=True)
-        
-        github = GitHubAPI()
+    started = engine_manager.start(retry=True)
+    status = engine_manager.status()
+    return {
+        "message": "Initialization started" if started else status["message"],
+        "success": True,
+        **status
+    }
+
+@app.post("/api/chat/refresh")
+async def refresh():
+    """
+    Re-index only the repositories that changed since the last build
+    """
+    # A partially indexed engine is still building; refresh once it is ready
+    if not engine_manager.is_ready:
+        raise not_ready_error()
+    engine = engine_manager.engine
+    
+    def refresh_repositories():
+        # GitHub calls block, so they run in the threadpool along with the re-index
+        github = create_github_api(priority=PRIORITY_BACKGROUND)
         repos = github.get_repositories()
+        if not repos:
+            return None
+        return engine.refresh_knowledge_base(repos, github_api=github)
+    
+    try:
+        summary = await run_in_threadpool(refresh_repositories)
         
-        if repos:
-            rag_engine.initialize_knowledge_base(repos)
-            is_initialized = True
-            return {"message": f"Initialized with {len(repos)} repositories", "success": True}
-        else:
+        if summary is None:
             return {"message": "No repositories found", "success": False}
+        
+        return {
+            "message": (
+                f"Refreshed {len(summary['added']) + len(summary['updated'])} repositories, "
+                f"removed {len(summary['removed'])}"
+            ),
+            "success": True,
+            **summary
+        }
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,24 +1,65 @@
 """
 AI Chatbot Component
 """
+import uuid
 import streamlit as st
-from ai.rag_engine import RAGEngine
-from utils.github_api import GitHubAPI
+import config
+from ai.engine_manager import get_engine_manager
+
+@st.cache_resource(show_spinner=False)
+def get_chatbot():
+    """Engine shared by every session; it loads in a background thread"""
+    chatbot = get_engine_manager()
+    chatbot.start()
+    return chatbot
 
 def initialize_chatbot():
-    """Initialize the chatbot and knowledge base"""
-    if 'rag_engine' not in st.session_state:
-        st.session_state.rag_engine = RAGEngine(use_groq=True)
-        
-        # Load repositories for knowledge base
-        github = GitHubAPI()
-        repos = github.get_repositories()
-        
-        if repos:
-            st.session_state.rag_engine.initialize_knowledge_base(repos)
+    """Start loading the shared engine and set up this session's chat history"""
+    chatbot = get_chatbot()
     
     if 'chat_history' not in st.session_state:
         st.session_state.chat_history = []
+    # The engine keeps this session's conversation memory under this id
+    if 'chat_session_id' not in st.session_state:
+        st.session_state.chat_session_id = uuid.uuid4().hex
+    
+    return chatbot
+
+def ask(chatbot, question):
+    """Answer a question in this session's conversation and record both messages"""
+    st.session_state.chat_history.append({
+        'role': 'user',
+        'content': question
+    })
+    
+    response = chatbot.get_response(question, session_id=st.session_state.chat_session_id)
+    
+    st.session_state.chat_history.append({
+        'role': 'assistant',
+        'content': response
+    })
+    # Only recent messages are displayed; the engine summarizes older turns itself
+    del st.session_state.chat_history[:-config.CHAT_HISTORY_LIMIT]
+
+def render_loading_status(chatbot):
+    """Show initialization progress while the engine is not ready yet"""
+    status = chatbot.status()
+    if status["ready"]:
+        return
+    
+    if status["stage"] == "failed":
+        st.error(f"{status['message']}: {status['error']}")
+        if st.button("🔄 Retry", key="chatbot_retry"):
+            chatbot.start(retry=True)
+            st.rerun()
+        return
+    
+    st.progress(
+        status["progress"],
+        text=f"{status['message']} Contact details, skills and repository stats are already available."
+    )
+    if st.button("🔄 Check again", key="chatbot_status"):
+        st.rerun()
 
 def render_chatbot():
     """Render the AI chatbot interface"""
@@ -35,7 +76,8 @@ def render_chatbot():
     """, unsafe_allow_html=True)
     
     # Initialize chatbot
-    initialize_chatbot()
+    chatbot = initialize_chatbot()
+    render_loading_status(chatbot)
     
     # Chat container
     st.markdown('<div class="glass-card fade-in">', unsafe_allow_html=True)
@@ -96,21 +138,9 @@ def render_chatbot():
     
     # Handle user input
     if send_button and user_input:
-        # Add user message to history
-        st.session_state.chat_history.append({
-            'role': 'user',
-            'content': user_input
-        })
-        
         # Get AI response
         with st.spinner("Thinking..."):
-            response = st.session_state.rag_engine.get_response(user_input)
-        
-        # Add AI response to history
-        st.session_state.chat_history.append({
-            'role': 'assistant',
-            'content': response
-        })
+            ask(chatbot, user_input)
         
         # Rerun to update chat display
         st.rerun()
@@ -118,7 +148,9 @@ def render_chatbot():
     # Clear chat button
     if st.session_state.chat_history:
         if st.button("🗑️ Clear Chat", use_container_width=False):
+            chatbot.reset_conversation(st.session_state.chat_session_id)
             st.session_state.chat_history = []
+            st.session_state.chat_session_id = uuid.uuid4().hex
             st.rerun()
     
     # Suggested questions
@@ -140,15 +172,7 @@ def render_chatbot():
     for idx, suggestion in enumerate(suggestions):
         with cols[idx % 2]:
             if st.button(suggestion, key=f"suggestion_{idx}", use_container_width=True):
-                st.session_state.chat_history.append({
-                    'role': 'user',
-                    'content': suggestion
-                })
-                response = st.session_state.rag_engine.get_response(suggestion)
-                st.session_state.chat_history.append({
-                    'role': 'assistant',
-                    'content': response
-                })
+                ask(chatbot, suggestion)
                 st.rerun()
     
     st.markdown("</div></div>", unsafe_allow_html=True)
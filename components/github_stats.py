@@ -4,7 +4,7 @@ GitHub Statistics Dashboard Component
 import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
-from utils.github_api import GitHubAPI
+from utils.github_api import create_github_api
 import pandas as pd
 from datetime import datetime, timedelta
 
@@ -121,7 +121,7 @@ def render_github_stats():
     """, unsafe_allow_html=True)
     
     # Initialize GitHub API
-    github = GitHubAPI()
+    github = create_github_api()
     
     # Fetch statistics
     with st.spinner("Fetching GitHub statistics..."):
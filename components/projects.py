@@ -2,7 +2,7 @@
 Projects Section Component with 3D Flip Cards
 """
 import streamlit as st
-from utils.github_api import GitHubAPI
+from utils.github_api import create_github_api
 from utils.data_processor import (
     categorize_project, calculate_complexity_score, 
     filter_repositories, sort_repositories, get_featured_repos,
@@ -95,7 +95,7 @@ def render_projects():
     """, unsafe_allow_html=True)
     
     # Initialize GitHub API
-    github = GitHubAPI()
+    github = create_github_api()
     
     # Fetch repositories
     with st.spinner("Loading projects from GitHub..."):
@@ -10,6 +10,13 @@ load_dotenv()
 # GitHub Configuration
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 GITHUB_USERNAME = os.getenv("GITHUB_USERNAME", "sankalp250")
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+GITHUB_BACKEND = os.getenv("GITHUB_BACKEND", "rest").lower()  # "rest" or "graphql"
+GITHUB_GRAPHQL_URL = os.getenv("GITHUB_GRAPHQL_URL", f"{GITHUB_API_URL.rstrip('/')}/graphql")
+GITHUB_GRAPHQL_PAGE_SIZE = int(os.getenv("GITHUB_GRAPHQL_PAGE_SIZE", "40"))  # Repositories per query; each carries up to four README blobs
+GITHUB_MAX_WORKERS = int(os.getenv("GITHUB_MAX_WORKERS", "8"))  # Concurrent requests for bulk fetches
+GITHUB_RATE_LIMIT_RESERVE = float(os.getenv("GITHUB_RATE_LIMIT_RESERVE", "0.1"))  # Budget share kept for page data
+GITHUB_RATE_LIMIT_MAX_WAIT = float(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT", "10"))  # Seconds a page request may queue
 
 # API Keys
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
@@ -67,6 +74,74 @@ PROJECT_CATEGORIES = {
 
 # Cache Settings
 CACHE_TTL = 3600  # 1 hour in seconds
+CACHE_STALE_TTL = int(os.getenv("CACHE_STALE_TTL", "86400"))  # Serve stale data while refreshing, for up to a day
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()  # "memory" or "sqlite" (shared across processes)
+CACHE_PATH = os.getenv("CACHE_PATH", ".cache/github_cache.sqlite3")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "2048"))
+REFRESH_INTERVAL = int(os.getenv("REFRESH_INTERVAL", str(int(CACHE_TTL * 0.8))))  # Re-fetch before entries expire
+
+# Knowledge Base Settings
+CHROMA_PERSIST_DIR = os.getenv("CHROMA_PERSIST_DIR", "./chroma_db")
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma").lower()  # "chroma" or "numpy" (in-process matrix)
+KB_ARTIFACT_PATH = os.getenv("KB_ARTIFACT_PATH", "")  # Pre-built index from `python -m ai.build_index`, served read-only
+RESUME_PATH = os.getenv("RESUME_PATH", "Sankalp_Singh_resume.pdf")
+RESUME_CACHE_PATH = os.getenv("RESUME_CACHE_PATH", ".cache/resume_text.json")  # Extracted text, keyed on file hash + mtime
+KB_MARKDOWN_DIRS = [path.strip() for path in os.getenv("KB_MARKDOWN_DIRS", "").split(",") if path.strip()]  # Extra local Markdown folders
+INDEX_BATCH_SIZE = int(os.getenv("INDEX_BATCH_SIZE", "128"))  # Chunks embedded and made searchable per batch
+README_BATCH_SIZE = int(os.getenv("README_BATCH_SIZE", "8"))  # READMEs fetched from GitHub per batch while indexing
+MARKDOWN_CHUNK_SIZE = int(os.getenv("MARKDOWN_CHUNK_SIZE", "800"))  # Characters per README/Markdown chunk, split at headings
+MARKDOWN_MAX_CHUNKS = int(os.getenv("MARKDOWN_MAX_CHUNKS", "8"))  # Chunks kept per README/Markdown file
+MARKDOWN_MAX_CODE_LINES = int(os.getenv("MARKDOWN_MAX_CODE_LINES", "8"))  # Longer code blocks are cut to this many lines
+
+# Retrieval Settings
+RETRIEVAL_K = int(os.getenv("RETRIEVAL_K", "5"))  # Chunks sent to the LLM per question
+HYBRID_SEARCH = os.getenv("HYBRID_SEARCH", "true").lower() == "true"  # Fuse BM25 keyword and vector results
+HYBRID_FETCH_K = int(os.getenv("HYBRID_FETCH_K", "20"))  # Candidates taken from each retriever before fusion
+RRF_K = int(os.getenv("RRF_K", "60"))  # Reciprocal rank fusion damping constant
+CONTEXT_MAX_TOKENS = int(os.getenv("CONTEXT_MAX_TOKENS", "1200"))  # Prompt budget for retrieved context
+QUERY_ROUTER = os.getenv("QUERY_ROUTER", "true").lower() == "true"  # Answer structured questions from data
+RERANKER_ENABLED = os.getenv("RERANKER_ENABLED", "false").lower() == "true"  # Rerank candidates with a local cross-encoder
+RERANKER_MODEL = os.getenv("RERANKER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+RERANK_FETCH_K = int(os.getenv("RERANK_FETCH_K", "20"))  # First-stage candidates passed to the reranker
+RERANK_BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", "16"))  # (question, chunk) pairs scored per forward pass
+RERANK_TIME_BUDGET_MS = float(os.getenv("RERANK_TIME_BUDGET_MS", "250"))  # Stop scoring batches past this budget
+RERANK_THRESHOLD = float(os.getenv("RERANK_THRESHOLD", "0.1"))  # Minimum 0-1 relevance kept beyond RERANK_MIN_K
+RERANK_MIN_K = int(os.getenv("RERANK_MIN_K", "2"))  # Chunks always kept; RETRIEVAL_K is the maximum
+
+# LLM Settings
+LLM_MODELS = os.getenv("LLM_MODELS", "groq:llama-3.3-70b-versatile,gemini:gemini-pro")  # Failover order
+FAST_LLM_MODEL = os.getenv("FAST_LLM_MODEL", "")  # Optional smaller Groq model for short factual questions
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))  # Seconds before failing over to the next provider
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "1"))  # Client-side retries before failing over
+LLM_COOLDOWN = float(os.getenv("LLM_COOLDOWN", "30"))  # Seconds a rate-limited provider is skipped
+LLM_HEDGE = os.getenv("LLM_HEDGE", "false").lower() == "true"  # Send a backup request when a call runs past p95
+LLM_HEDGE_DELAY = float(os.getenv("LLM_HEDGE_DELAY", "2"))  # Hedge delay until enough latency samples exist
+
+# Conversation Settings
+CONVERSATION_TURNS = int(os.getenv("CONVERSATION_TURNS", "4"))  # Recent turns kept verbatim in the prompt
+CONVERSATION_SUMMARY_CHARS = int(os.getenv("CONVERSATION_SUMMARY_CHARS", "1200"))  # Cap on the rolling summary of older turns
+CONVERSATION_TURN_CHARS = int(os.getenv("CONVERSATION_TURN_CHARS", "600"))  # Each recent question/answer is clipped to this
+CONVERSATION_MAX_SESSIONS = int(os.getenv("CONVERSATION_MAX_SESSIONS", "500"))  # Conversations kept in memory (LRU)
+CONVERSATION_TTL = int(os.getenv("CONVERSATION_TTL", "3600"))  # Idle seconds before a conversation is forgotten
+CONVERSATION_REWRITE = os.getenv("CONVERSATION_REWRITE", "true").lower() == "true"  # Rewrite follow-ups into standalone queries
+CONVERSATION_REWRITE_TIMEOUT = float(os.getenv("CONVERSATION_REWRITE_TIMEOUT", "5"))
+CHAT_HISTORY_LIMIT = int(os.getenv("CHAT_HISTORY_LIMIT", "40"))  # Messages shown in the Streamlit chat
+
+# Embedding Settings
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024"))
+EMBEDDING_COALESCE_MS = float(os.getenv("EMBEDDING_COALESCE_MS", "5"))  # Wait for concurrent queries to batch
+
+# Answer Cache Settings
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "256"))
+ANSWER_CACHE_TTL = int(os.getenv("ANSWER_CACHE_TTL", "3600"))
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.93"))  # 1.0 = exact matches only
+
+# Chat Concurrency Settings
+RETRIEVAL_WORKERS = int(os.getenv("RETRIEVAL_WORKERS", "4"))  # Threads for embedding + vector search
+CHAT_MAX_CONCURRENCY = int(os.getenv("CHAT_MAX_CONCURRENCY", "8"))  # Chat requests processed at once
+CHAT_MAX_QUEUE = int(os.getenv("CHAT_MAX_QUEUE", "16"))  # Requests allowed to wait for a slot
+CHAT_QUEUE_TIMEOUT = float(os.getenv("CHAT_QUEUE_TIMEOUT", "10"))  # Seconds a request may wait before a 429
 
 # Featured Projects (will be shown first)
 FEATURED_REPOS = [
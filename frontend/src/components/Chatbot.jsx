@@ -6,21 +6,26 @@ import './Chatbot.css';
 
 const API_BASE_URL = 'http://localhost:8000';
 
+// One conversation per page load; the backend keeps its memory under this id
+const newSessionId = () => (window.crypto?.randomUUID?.() ?? `${Date.now()}-${Math.random().toString(36).slice(2)}`);
+
 const ChatBot = () => {
     const [isOpen, setIsOpen] = useState(false);
     const [messages, setMessages] = useState([]);
     const [inputMessage, setInputMessage] = useState('');
     const [isLoading, setIsLoading] = useState(false);
     const [isInitialized, setIsInitialized] = useState(false);
+    const [initProgress, setInitProgress] = useState(0);
     const [error, setError] = useState(null);
     const messagesEndRef = useRef(null);
+    const sessionIdRef = useRef(newSessionId());
 
-    // Check backend status on mount
+    // Check backend status on mount; poll faster while the engine is loading
     useEffect(() => {
         checkStatus();
-        const interval = setInterval(checkStatus, 30000); // Check every 30s
+        const interval = setInterval(checkStatus, isInitialized ? 30000 : 3000);
         return () => clearInterval(interval);
-    }, []);
+    }, [isInitialized]);
 
     // Auto-scroll to bottom when new messages arrive
     useEffect(() => {
@@ -37,6 +42,7 @@ const ChatBot = () => {
             const response = await axios.get(`${API_BASE_URL}/api/chat/status`);
             console.log('Status response:', response.data);
             setIsInitialized(response.data.initialized);
+            setInitProgress(response.data.progress || 0);
             setError(null);
         } catch (err) {
             console.error('Failed to check status:', err);
@@ -60,31 +66,83 @@ const ChatBot = () => {
 
         try {
             console.log('Sending message:', inputMessage);
-            const response = await axios.post(`${API_BASE_URL}/api/chat`, {
-                message: inputMessage
+            const response = await fetch(`${API_BASE_URL}/api/chat/stream`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ message: inputMessage, session_id: sessionIdRef.current })
             });
-            console.log('Chat response:', response.data);
 
-            if (response.data.success) {
-                const aiMessage = {
-                    role: 'assistant',
-                    content: response.data.response,
-                    timestamp: new Date().toISOString()
-                };
-                setMessages(prev => [...prev, aiMessage]);
-            } else {
-                console.error('API returned error:', response.data.error);
-                setError(response.data.error || 'Failed to get response');
+            if (!response.ok) {
+                const body = await response.json().catch(() => ({}));
+                throw new Error(body.detail || `Request failed with status ${response.status}`);
             }
+
+            let started = false;
+            await readEventStream(response, (event, data) => {
+                if (event === 'token') {
+                    if (!started) {
+                        // First token: swap the typing indicator for the streamed answer
+                        started = true;
+                        setIsLoading(false);
+                        setMessages(prev => [...prev, {
+                            role: 'assistant',
+                            content: data.text,
+                            timestamp: new Date().toISOString()
+                        }]);
+                    } else {
+                        setMessages(prev => {
+                            const updated = [...prev];
+                            const last = updated[updated.length - 1];
+                            updated[updated.length - 1] = { ...last, content: last.content + data.text };
+                            return updated;
+                        });
+                    }
+                } else if (event === 'sources') {
+                    console.log('Chat sources:', data.sources);
+                } else if (event === 'done') {
+                    console.log('Chat timings:', data);
+                } else if (event === 'error') {
+                    console.error('API returned error:', data.error);
+                    setError(data.error || 'Failed to get response');
+                }
+            });
         } catch (err) {
             console.error('Chat error:', err);
-            console.error('Error details:', err.response?.data);
-            setError(err.response?.data?.detail || 'Failed to send message. Make sure the backend is running on port 8000.');
+            setError(err instanceof TypeError
+                ? 'Failed to send message. Make sure the backend is running on port 8000.'
+                : err.message);
         } finally {
             setIsLoading(false);
         }
     };
 
+    // Parse a Server-Sent Events body, calling onEvent(event, data) per event
+    const readEventStream = async (response, onEvent) => {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const rawEvent = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                let event = 'message';
+                let data = '';
+                for (const line of rawEvent.split('\n')) {
+                    if (line.startsWith('event: ')) event = line.slice(7);
+                    else if (line.startsWith('data: ')) data += line.slice(6);
+                }
+                onEvent(event, data ? JSON.parse(data) : {});
+            }
+        }
+    };
+
     const handleKeyPress = (e) => {
         if (e.key === 'Enter' && !e.shiftKey) {
             e.preventDefault();
@@ -95,6 +153,8 @@ const ChatBot = () => {
     const clearChat = () => {
         setMessages([]);
         setError(null);
+        // Start a fresh conversation so earlier turns no longer shape answers
+        sessionIdRef.current = newSessionId();
     };
 
     const suggestedQuestions = [
@@ -150,7 +210,7 @@ const ChatBot = () => {
                                         ) : (
                                             <>
                                                 <span className="status-dot"></span>
-                                                Initializing...
+                                                Initializing... {Math.round(initProgress * 100)}%
                                             </>
                                         )}
                                     </p>
@@ -250,12 +310,12 @@ const ChatBot = () => {
                                 value={inputMessage}
                                 onChange={(e) => setInputMessage(e.target.value)}
                                 onKeyPress={handleKeyPress}
-                                disabled={!isInitialized || isLoading}
+                                disabled={isLoading}
                             />
                             <motion.button
                                 className="send-btn"
                                 onClick={sendMessage}
-                                disabled={!inputMessage.trim() || !isInitialized || isLoading}
+                                disabled={!inputMessage.trim() || isLoading}
                                 whileHover={{ scale: 1.05 }}
                                 whileTap={{ scale: 0.95 }}
                             >
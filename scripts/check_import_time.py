@@ -0,0 +1,96 @@
+"""
+Import-time guard for the Streamlit page and the RAG engine
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for
+each target and fails if a heavy dependency is loaded at import time or if
+the import exceeds its time budget.
+
+Usage:
+    python scripts/check_import_time.py
+    python scripts/check_import_time.py --budget-ms 1500 --top 15
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies that must only load once the chatbot engine is actually built
+HEAVY_MODULES = {
+    "torch",
+    "transformers",
+    "sentence_transformers",
+    "langchain_groq",
+    "langchain_google_genai",
+    "langchain_community",
+    "langchain_text_splitters",
+    "chromadb",
+    "PyPDF2",
+}
+
+# Module imported at startup -> extra modules it must not pull in
+TARGETS = {
+    "components.chatbot": HEAVY_MODULES | {"ai.rag_engine"},
+    "ai.rag_engine": HEAVY_MODULES,
+    "ai.engine_manager": HEAVY_MODULES | {"ai.rag_engine", "numpy"},
+}
+
+def measure(module: str):
+    """Return `{module: (self_us, cumulative_us)}` for a fresh import of `module`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="fail if any target takes longer than this to import")
+    parser.add_argument("--top", type=int, default=10,
+                        help="number of slowest modules to list per target")
+    args = parser.parse_args()
+
+    failed = False
+    for module, forbidden in TARGETS.items():
+        try:
+            timings = measure(module)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            failed = True
+            continue
+
+        total_ms = timings.get(module, (0, 0))[1] / 1000
+        print(f"\n📦 {module}: {total_ms:.0f} ms")
+        slowest = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+        for name, (self_us, _) in slowest:
+            print(f"   {self_us / 1000:8.1f} ms  {name}")
+
+        loaded = sorted(
+            name for name in timings
+            if name in forbidden or name.split(".")[0] in forbidden
+        )
+        if loaded:
+            print(f"❌ {module} imports heavy modules at import time: {', '.join(loaded)}")
+            failed = True
+        if args.budget_ms is not None and total_ms > args.budget_ms:
+            print(f"❌ {module} took {total_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+            failed = True
+
+    print("\n❌ Import-time check failed" if failed else "\n✅ Import-time check passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+Shared cache tier with TTL and stale-while-revalidate, independent of Streamlit
+"""
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+import config
+
+class CacheBackend:
+    """Key/value store of JSON-serialisable values with a hard expiry"""
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return `(value, stored_at)` or None if missing or expired"""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, stored_at: float, expires_at: float):
+        """Store a value until `expires_at`"""
+        raise NotImplementedError
+
+    def add(self, key: str, value: Any, stored_at: float, expires_at: float) -> bool:
+        """Store a value only if the key is missing or expired; returns whether it was stored"""
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        """Remove a single entry"""
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove every entry"""
+        raise NotImplementedError
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, stored_at, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value, stored_at
+
+    def _set(self, key: str, value: Any, stored_at: float, expires_at: float):
+        self._entries[key] = (value, stored_at, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def set(self, key: str, value: Any, stored_at: float, expires_at: float):
+        with self._lock:
+            self._set(key, value, stored_at, expires_at)
+
+    def add(self, key: str, value: Any, stored_at: float, expires_at: float) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] > stored_at:
+                return False
+            self._set(key, value, stored_at, expires_at)
+            return True
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class SQLiteCache(CacheBackend):
+    """On-disk cache shared by every process pointing at the same file
+
+    Uses WAL mode so several uvicorn workers and the Streamlit app can read
+    concurrently while one of them writes.
+    """
+
+    PRUNE_EVERY = 100  # Writes between sweeps of expired rows
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._writes = 0
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "stored_at REAL NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread; sqlite3 connections aren't shareable"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        row = self._connect().execute(
+            "SELECT value, stored_at FROM cache WHERE key = ? AND expires_at > ?",
+            (key, time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, stored_at: float, expires_at: float):
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, stored_at, expires_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), stored_at, expires_at)
+        )
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+
+    def add(self, key: str, value: Any, stored_at: float, expires_at: float) -> bool:
+        # A single conditional upsert, so two processes can't both claim the key
+        cursor = self._connect().execute(
+            "INSERT INTO cache (key, value, stored_at, expires_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, stored_at = excluded.stored_at, "
+            "expires_at = excluded.expires_at WHERE cache.expires_at <= excluded.stored_at",
+            (key, json.dumps(value), stored_at, expires_at)
+        )
+        return cursor.rowcount > 0
+
+    def delete(self, key: str):
+        self._connect().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self):
+        self._connect().execute("DELETE FROM cache")
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache() -> CacheBackend:
+    """Process-wide cache backend selected by `config.CACHE_BACKEND`"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            if config.CACHE_BACKEND == "sqlite":
+                _cache = SQLiteCache(config.CACHE_PATH)
+            else:
+                _cache = MemoryCache(config.CACHE_MAX_ENTRIES)
+        return _cache
+
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
+def _revalidate_in_background(key: str, load):
+    """Recompute a stale entry on a daemon thread, once per key at a time"""
+    with _revalidating_lock:
+        if key in _revalidating:
+            return
+        _revalidating.add(key)
+
+    def run():
+        try:
+            load()
+        except Exception as e:
+            print(f"⚠️ Background refresh of {key} failed: {e}")
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(key)
+
+    threading.Thread(target=run, name="cache-revalidate", daemon=True).start()
+
+def cached(ttl: float = config.CACHE_TTL, stale_ttl: float = config.CACHE_STALE_TTL):
+    """Cache a method's JSON-serialisable result in the shared cache tier
+
+    Fresh entries (younger than `ttl`) are returned directly. Entries in the
+    following `stale_ttl` window are returned immediately while a background
+    thread recomputes them. Exceptions are not cached. The key includes the
+    instance's `cache_namespace` attribute, if it has one.
+
+    The wrapper exposes `refresh(self, *args)` to recompute and store a value
+    regardless of its age, and `invalidate(self, *args)` to drop it.
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        def make_key(self, args, kwargs):
+            namespace = getattr(self, "cache_namespace", "")
+            return json.dumps([namespace, name, args, kwargs], sort_keys=True, default=str)
+
+        def load(self, key, args, kwargs):
+            value = func(self, *args, **kwargs)
+            now = time.time()
+            get_cache().set(key, value, now, now + ttl + stale_ttl)
+            return value
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = make_key(self, args, kwargs)
+            entry = get_cache().get(key)
+            if entry is not None:
+                value, stored_at = entry
+                if time.time() - stored_at < ttl:
+                    return value
+                _revalidate_in_background(key, lambda: load(self, key, args, kwargs))
+                return value
+            return load(self, key, args, kwargs)
+
+        def refresh(self, *args, **kwargs):
+            return load(self, make_key(self, args, kwargs), args, kwargs)
+
+        def invalidate(self, *args, **kwargs):
+            get_cache().delete(make_key(self, args, kwargs))
+
+        wrapper.refresh = refresh
+        wrapper.invalidate = invalidate
+        return wrapper
+
+    return decorator
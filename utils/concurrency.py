@@ -0,0 +1,67 @@
+"""
+Concurrency limits with backpressure for async request handlers
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+class CapacityExceeded(Exception):
+    """Raised when a request can't get a processing slot in time"""
+
+class ConcurrencyLimiter:
+    """Caps in-flight work and the number of requests allowed to wait for it
+
+    Requests beyond `max_concurrent` wait for a slot, at most `max_queue`
+    of them and for at most `queue_timeout` seconds. Anything else is
+    rejected straight away, so callers can answer 429 instead of letting
+    latency grow without bound.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    def has_capacity(self) -> bool:
+        """Whether acquire() would admit a request right now"""
+        return self.active + self.waiting < self.max_concurrent + self.max_queue
+
+    async def acquire(self):
+        """Wait for a processing slot, or raise CapacityExceeded"""
+        # Admitted requests are counted in `waiting` or `active` before any await
+        if not self.has_capacity():
+            raise CapacityExceeded("Too many requests are waiting")
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise CapacityExceeded("Timed out waiting for a free slot")
+        finally:
+            self.waiting -= 1
+        self.active += 1
+
+    def release(self):
+        """Give back a slot taken with acquire()"""
+        self.active -= 1
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a processing slot for the duration of the block"""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def status(self) -> dict:
+        """Current load, for diagnostics"""
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue
+        }
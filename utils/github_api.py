@@ -1,128 +1,268 @@
 """
 GitHub API Client for fetching repository data and statistics
 """
+import base64
+import threading
+from collections import OrderedDict
 import requests
-import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import config
+from utils.cache import cached
+from utils.rate_limiter import RateLimitScheduler, PRIORITY_INTERACTIVE, is_rate_limited
+
+try:
+    import streamlit as st
+except ImportError:  # The API backend runs without Streamlit
+    st = None
+
+class ValidatorCache:
+    """Thread-safe LRU of ETag/Last-Modified validators and their payloads"""
+    
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Tuple) -> Optional[Dict]:
+        """Return the cached validators and payload for a request key"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+    
+    def put(self, key: Tuple, etag: Optional[str], last_modified: Optional[str], payload: Any):
+        """Remember a response's validators and payload"""
+        with self._lock:
+            self._entries[key] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "payload": payload
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+def report_error(message: str):
+    """Show an error in the Streamlit page when there is one, else log it"""
+    if st is not None and st.runtime.exists():
+        st.error(message)
+    else:
+        print(f"⚠️ {message}")
+
+_session = None
+_session_lock = threading.Lock()
+_validators = ValidatorCache()
+_scheduler = RateLimitScheduler(reserve_fraction=config.GITHUB_RATE_LIMIT_RESERVE)
+
+def _shared_session() -> requests.Session:
+    """Process-wide pooled session with keep-alive and retry/backoff"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=frozenset(["GET"]),
+                respect_retry_after_header=True
+            )
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=max(10, config.GITHUB_MAX_WORKERS * 2),
+                max_retries=retry
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+def create_github_api(**kwargs) -> "GitHubAPI":
+    """Create the GitHub client selected by `config.GITHUB_BACKEND`
+    
+    The GraphQL backend needs a token; without one the REST client is used.
+    """
+    if config.GITHUB_BACKEND == "graphql":
+        if config.GITHUB_TOKEN:
+            from utils.github_graphql import GitHubGraphQLAPI
+            return GitHubGraphQLAPI(**kwargs)
+        print("⚠️ GITHUB_BACKEND=graphql requires GITHUB_TOKEN, falling back to REST")
+    return GitHubAPI(**kwargs)
 
 class GitHubAPI:
     """Client for interacting with GitHub API"""
     
-    def __init__(self):
-        self.base_url = "https://api.github.com"
+    def __init__(self, session: Optional[requests.Session] = None,
+                 scheduler: Optional[RateLimitScheduler] = None,
+                 priority: int = PRIORITY_INTERACTIVE):
+        self.base_url = config.GITHUB_API_URL.rstrip("/")
         self.username = config.GITHUB_USERNAME
         self.headers = {
             "Accept": "application/vnd.github.v3+json",
         }
         if config.GITHUB_TOKEN:
             self.headers["Authorization"] = f"token {config.GITHUB_TOKEN}"
+        self.timeout = 10
+        self.session = session or _shared_session()
+        self.validators = _validators
+        self.scheduler = scheduler or _scheduler
+        self.priority = priority
+        # Visitors shouldn't wait out a whole rate-limit window; background work may
+        self.max_wait = config.GITHUB_RATE_LIMIT_MAX_WAIT if priority <= PRIORITY_INTERACTIVE else None
+    
+    @property
+    def cache_namespace(self) -> str:
+        """Distinguishes cached results of different accounts and API hosts"""
+        return f"{self.base_url}|{self.username}"
+    
+    def _get_json(self, path: str, params: Optional[Dict] = None,
+                  allow_not_found: bool = False) -> Any:
+        """GET a JSON resource, revalidating cached payloads with ETag/Last-Modified
+        
+        A `304 Not Modified` answer returns the cached payload and does not
+        count against the GitHub rate limit. Requests are admitted by the
+        rate-limit scheduler and retried after a rate-limit rejection once
+        the scheduler allows it.
+        """
+        url = f"{self.base_url}{path}"
+        key = (url, tuple(sorted((params or {}).items())), self.headers.get("Authorization"))
+        cached = self.validators.get(key)
+        
+        headers = dict(self.headers)
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+        
+        for attempt in range(3):
+            self.scheduler.acquire(self.priority, timeout=self.max_wait)
+            response = self.session.get(url, headers=headers, params=params, timeout=self.timeout)
+            self.scheduler.update(response.status_code, response.headers)
+            if not is_rate_limited(response.status_code, response.headers):
+                break
+        
+        if response.status_code == 304 and cached:
+            return cached["payload"]
+        if response.status_code == 404 and allow_not_found:
+            return None
+        response.raise_for_status()
+        
+        payload = response.json()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self.validators.put(key, etag, last_modified, payload)
+        return payload
     
-    @st.cache_data(ttl=config.CACHE_TTL, show_spinner=False)
-    def get_user_info(_self) -> Dict:
+    @cached()
+    def fetch_user_info(self) -> Dict:
+        """Fetch user profile information (cached, raises on failure)"""
+        return self._get_json(f"/users/{self.username}")
+    
+    def get_user_info(self) -> Dict:
         """Fetch user profile information"""
         try:
-            response = requests.get(
-                f"{_self.base_url}/users/{_self.username}",
-                headers=_self.headers
-            )
-            response.raise_for_status()
-            return response.json()
+            return self.fetch_user_info()
         except Exception as e:
-            st.error(f"Error fetching user info: {e}")
+            report_error(f"Error fetching user info: {e}")
             return {}
     
-    @st.cache_data(ttl=config.CACHE_TTL, show_spinner=False)
-    def get_repositories(_self) -> List[Dict]:
+    @cached()
+    def fetch_repositories(self) -> List[Dict]:
+        """Fetch all public repositories (cached, raises on failure)"""
+        repos = []
+        page = 1
+        while True:
+            data = self._get_json(
+                f"/users/{self.username}/repos",
+                params={"per_page": 100, "page": page, "sort": "updated"}
+            )
+            if not data:
+                break
+            repos.extend(data)
+            page += 1
+        return repos
+    
+    def get_repositories(self) -> List[Dict]:
         """Fetch all public repositories"""
         try:
-            repos = []
-            page = 1
-            while True:
-                response = requests.get(
-                    f"{_self.base_url}/users/{_self.username}/repos",
-                    headers=_self.headers,
-                    params={"per_page": 100, "page": page, "sort": "updated"}
-                )
-                response.raise_for_status()
-                data = response.json()
-                if not data:
-                    break
-                repos.extend(data)
-                page += 1
-            return repos
+            return self.fetch_repositories()
         except Exception as e:
-            st.error(f"Error fetching repositories: {e}")
+            report_error(f"Error fetching repositories: {e}")
             return []
     
-    @st.cache_data(ttl=config.CACHE_TTL, show_spinner=False)
-    def get_repo_languages(_self, repo_name: str) -> Dict:
+    @cached()
+    def fetch_repo_languages(self, repo_name: str) -> Dict:
+        """Fetch languages used in a repository (cached, raises on failure)"""
+        return self._get_json(f"/repos/{self.username}/{repo_name}/languages")
+    
+    def get_repo_languages(self, repo_name: str) -> Dict:
         """Fetch languages used in a repository"""
         try:
-            response = requests.get(
-                f"{_self.base_url}/repos/{_self.username}/{repo_name}/languages",
-                headers=_self.headers
-            )
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
+            return self.fetch_repo_languages(repo_name)
+        except Exception:
             return {}
     
-    @st.cache_data(ttl=config.CACHE_TTL, show_spinner=False)
-    def get_repo_stats(_self, repo_name: str) -> Dict:
+    @cached()
+    def get_repo_stats(self, repo_name: str) -> Dict:
         """Fetch detailed statistics for a repository"""
+        # Get commits
         try:
-            # Get commits
-            commits_response = requests.get(
-                f"{_self.base_url}/repos/{_self.username}/{repo_name}/commits",
-                headers=_self.headers,
+            commits = self._get_json(
+                f"/repos/{self.username}/{repo_name}/commits",
                 params={"per_page": 100}
             )
-            commits_count = len(commits_response.json()) if commits_response.ok else 0
-            
-            # Get contributors
-            contributors_response = requests.get(
-                f"{_self.base_url}/repos/{_self.username}/{repo_name}/contributors",
-                headers=_self.headers
-            )
-            contributors_count = len(contributors_response.json()) if contributors_response.ok else 0
-            
-            return {
-                "commits": commits_count,
-                "contributors": contributors_count
-            }
-        except Exception as e:
-            return {"commits": 0, "contributors": 0}
+            commits_count = len(commits or [])
+        except requests.RequestException:
+            commits_count = 0
+        
+        # Get contributors
+        try:
+            contributors = self._get_json(f"/repos/{self.username}/{repo_name}/contributors")
+            contributors_count = len(contributors or [])
+        except requests.RequestException:
+            contributors_count = 0
+        
+        return {
+            "commits": commits_count,
+            "contributors": contributors_count
+        }
     
-    @st.cache_data(ttl=config.CACHE_TTL, show_spinner=False)
-    def get_contribution_data(_self) -> List[Dict]:
+    @cached()
+    def fetch_contribution_data(self) -> List[Dict]:
+        """Fetch contribution activity for heatmap (cached, raises on failure)"""
+        # Get events from the last year
+        events = self._get_json(
+            f"/users/{self.username}/events/public",
+            params={"per_page": 100}
+        )
+        
+        # Process events into daily contributions
+        contributions = {}
+        for event in events:
+            if event.get("type") in ["PushEvent", "PullRequestEvent", "IssuesEvent"]:
+                date = event["created_at"][:10]  # YYYY-MM-DD
+                contributions[date] = contributions.get(date, 0) + 1
+        
+        return [{"date": k, "count": v} for k, v in contributions.items()]
+    
+    def get_contribution_data(self) -> List[Dict]:
         """Fetch contribution activity for heatmap"""
         try:
-            # Get events from the last year
-            response = requests.get(
-                f"{_self.base_url}/users/{_self.username}/events/public",
-                headers=_self.headers,
-                params={"per_page": 100}
-            )
-            response.raise_for_status()
-            events = response.json()
-            
-            # Process events into daily contributions
-            contributions = {}
-            for event in events:
-                if event.get("type") in ["PushEvent", "PullRequestEvent", "IssuesEvent"]:
-                    date = event["created_at"][:10]  # YYYY-MM-DD
-                    contributions[date] = contributions.get(date, 0) + 1
-            
-            return [{"date": k, "count": v} for k, v in contributions.items()]
+            return self.fetch_contribution_data()
         except Exception as e:
-            st.error(f"Error fetching contributions: {e}")
+            report_error(f"Error fetching contributions: {e}")
             return []
     
-    def get_total_stats(_self) -> Dict:
+    def get_total_stats(self) -> Dict:
         """Calculate total statistics across all repositories"""
-        repos = _self.get_repositories()
+        repos = self.get_repositories()
         
         total_stars = sum(repo.get("stargazers_count", 0) for repo in repos)
         total_forks = sum(repo.get("forks_count", 0) for repo in repos)
@@ -130,8 +270,8 @@ class GitHubAPI:
         
         # Get all languages
         all_languages = {}
-        for repo in repos[:20]:  # Limit to avoid rate limiting
-            languages = _self.get_repo_languages(repo["name"])
+        repo_names = [repo["name"] for repo in repos]
+        for languages in self.get_repos_languages(repo_names).values():
             for lang, bytes_count in languages.items():
                 all_languages[lang] = all_languages.get(lang, 0) + bytes_count
         
@@ -143,26 +283,99 @@ class GitHubAPI:
             "public_repos": total_repos
         }
     
+    def refresh_cache(self) -> List[Dict]:
+        """Re-fetch every cached resource ahead of expiry
+        
+        Readers keep getting the previous snapshot until each new value is
+        stored. Returns the refreshed repository list.
+        """
+        repos = GitHubAPI.fetch_repositories.refresh(self)
+        for refresh in (GitHubAPI.fetch_user_info.refresh, GitHubAPI.fetch_contribution_data.refresh):
+            try:
+                refresh(self)
+            except Exception as e:
+                print(f"⚠️ Background refresh failed: {e}")
+        
+        def refresh_languages(repo_name):
+            try:
+                return GitHubAPI.fetch_repo_languages.refresh(self, repo_name)
+            except Exception:
+                return {}
+        
+        self._fetch_concurrently(refresh_languages, [repo["name"] for repo in repos])
+        return repos
+    
     def get_readme(self, repo_name: str) -> Optional[str]:
         """Get README content for a specific repository"""
-        try:
-            # Try different README filenames
-            readme_names = ['README.md', 'readme.md', 'README', 'readme']
-            
-            for readme_name in readme_names:
-                url = f"{self.base_url}/repos/{self.username}/{repo_name}/contents/{readme_name}"
-                response = requests.get(url, headers=self.headers, timeout=10)
-                
-                if response.status_code == 200:
-                    content = response.json()
-                    # README content is base64 encoded
-                    import base64
-                    readme_content = base64.b64decode(content['content']).decode('utf-8')
-                    return readme_content
-            
+        readme = self.get_readme_info(repo_name)
+        return readme["content"] if readme else None
+    
+    def get_readme_info(self, repo_name: str) -> Optional[Dict]:
+        """Get README content and blob SHA for a specific repository
+        
+        Returns None only when the repository has no README; any other
+        failure (timeouts, rate limits, server errors) raises, so callers
+        can tell a missing README from one they could not fetch.
+        """
+        # The /readme endpoint resolves whichever README file the repo uses
+        content = self._get_json(
+            f"/repos/{self.username}/{repo_name}/readme",
+            allow_not_found=True
+        )
+        if content is None:
             return None  # No README found
-            
-        except Exception as e:
-            print(f"Error getting README for {repo_name}: {e}")
-            return None
-
+        
+        # README content is base64 encoded
+        readme_content = base64.b64decode(content['content']).decode('utf-8', errors='replace')
+        return {"content": readme_content, "sha": content.get('sha')}
+    
+    def _fetch_concurrently(self, fetch, repo_names: List[str]) -> Dict:
+        """Run a per-repository fetch over a bounded thread pool"""
+        repo_names = list(dict.fromkeys(repo_names))
+        if not repo_names:
+            return {}
+        
+        workers = min(config.GITHUB_MAX_WORKERS, len(repo_names))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(repo_names, executor.map(fetch, repo_names)))
+    
+    def get_readmes(self, repo_names: List[str]) -> Dict[str, Optional[Dict]]:
+        """Fetch README content and SHA for many repositories concurrently
+        
+        Repositories without a README map to None; repositories whose fetch
+        failed are left out, so callers keep what they already have.
+        """
+        failed = object()
+        
+        def fetch(repo_name):
+            try:
+                return self.get_readme_info(repo_name)
+            except Exception as e:
+                print(f"Error getting README for {repo_name}: {e}")
+                return failed
+        
+        readmes = self._fetch_concurrently(fetch, repo_names)
+        return {name: readme for name, readme in readmes.items() if readme is not failed}
+    
+    def get_rate_limit_status(self) -> Dict:
+        """Current rate-limit budget as seen by the request scheduler"""
+        return self.scheduler.status()
+    
+    def get_repos_languages(self, repo_names: List[str]) -> Dict[str, Dict]:
+        """Fetch language maps for many repositories concurrently"""
+        return self._fetch_concurrently(self.get_repo_languages, repo_names)
+    
+    def get_repo_details(self, repo_names: List[str]) -> Dict[str, Dict]:
+        """Fetch READMEs and language maps for many repositories in one call"""
+        def fetch(repo_name):
+            try:
+                readme = self.get_readme_info(repo_name)
+            except Exception as e:
+                print(f"Error getting README for {repo_name}: {e}")
+                readme = None
+            return {
+                "readme": readme,
+                "languages": self.get_repo_languages(repo_name)
+            }
+        
+        return self._fetch_concurrently(fetch, repo_names)
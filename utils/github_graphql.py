@@ -0,0 +1,222 @@
+"""
+GraphQL-backed GitHub client that batches per-repository data
+"""
+import requests
+from typing import Dict, List, Optional
+import config
+from utils.cache import cached
+from utils.github_api import GitHubAPI
+from utils.rate_limiter import RateLimitScheduler, is_rate_limited
+
+# Filenames tried for the README, in the same order the REST client used to
+README_EXPRESSIONS = {
+    "readmeUpper": "HEAD:README.md",
+    "readmeLower": "HEAD:readme.md",
+    "readmePlain": "HEAD:README",
+    "readmePlainLower": "HEAD:readme",
+}
+
+REPOSITORIES_QUERY = """
+query($login: String!, $pageSize: Int!, $cursor: String) {
+  user(login: $login) {
+    repositories(first: $pageSize, after: $cursor, ownerAffiliations: OWNER,
+                 privacy: PUBLIC, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        databaseId
+        name
+        nameWithOwner
+        description
+        url
+        homepageUrl
+        stargazerCount
+        forkCount
+        isFork
+        isArchived
+        createdAt
+        updatedAt
+        pushedAt
+        diskUsage
+        licenseInfo { key name spdxId }
+        primaryLanguage { name }
+        repositoryTopics(first: 20) { nodes { topic { name } } }
+        languages(first: 20, orderBy: {field: SIZE, direction: DESC}) {
+          edges { size node { name } }
+        }
+        defaultBranchRef {
+          name
+          target { ... on Commit { history { totalCount } } }
+        }
+%s
+      }
+    }
+  }
+}
+""" % "\n".join(
+    f'        {alias}: object(expression: "{expression}") {{ ... on Blob {{ oid text }} }}'
+    for alias, expression in README_EXPRESSIONS.items()
+)
+
+# GraphQL has its own rate-limit budget, separate from REST
+_graphql_scheduler = RateLimitScheduler(reserve_fraction=config.GITHUB_RATE_LIMIT_RESERVE)
+
+def _to_rest_repo(node: Dict) -> Dict:
+    """Map a GraphQL repository node onto the REST `/users/{u}/repos` shape"""
+    license_info = node.get("licenseInfo")
+    default_branch = node.get("defaultBranchRef") or {}
+    return {
+        "id": node.get("databaseId"),
+        "name": node.get("name"),
+        "full_name": node.get("nameWithOwner"),
+        "description": node.get("description"),
+        "html_url": node.get("url"),
+        "homepage": node.get("homepageUrl"),
+        "stargazers_count": node.get("stargazerCount", 0),
+        "watchers_count": node.get("stargazerCount", 0),
+        "forks_count": node.get("forkCount", 0),
+        "fork": node.get("isFork", False),
+        "archived": node.get("isArchived", False),
+        "created_at": node.get("createdAt") or "",
+        "updated_at": node.get("updatedAt") or "",
+        "pushed_at": node.get("pushedAt") or "",
+        "size": node.get("diskUsage") or 0,
+        "language": (node.get("primaryLanguage") or {}).get("name"),
+        "topics": [
+            topic["topic"]["name"]
+            for topic in (node.get("repositoryTopics") or {}).get("nodes", [])
+        ],
+        "license": {
+            "key": license_info.get("key"),
+            "name": license_info.get("name"),
+            "spdx_id": license_info.get("spdxId"),
+        } if license_info else None,
+        "default_branch": default_branch.get("name"),
+    }
+
+def _extract_readme(node: Dict) -> Optional[Dict]:
+    """First README blob found on the default branch"""
+    for alias in README_EXPRESSIONS:
+        blob = node.get(alias)
+        if blob and blob.get("text") is not None:
+            return {"content": blob["text"], "sha": blob.get("oid")}
+    return None
+
+class GitHubGraphQLAPI(GitHubAPI):
+    """GitHub client that fetches every repository's details in paginated GraphQL queries
+
+    Repository metadata, languages with byte sizes, README text, commit
+    counts and topics arrive together, one request per page of
+    repositories. Results use the same dict shapes as the REST client.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("scheduler", _graphql_scheduler)
+        super().__init__(*args, **kwargs)
+        self.graphql_url = config.GITHUB_GRAPHQL_URL
+        self.page_size = config.GITHUB_GRAPHQL_PAGE_SIZE
+
+    def _post_graphql(self, query: str, variables: Dict) -> Dict:
+        """Run a GraphQL query through the rate-limit scheduler"""
+        for attempt in range(3):
+            self.scheduler.acquire(self.priority, timeout=self.max_wait)
+            response = self.session.post(
+                self.graphql_url,
+                headers=self.headers,
+                json={"query": query, "variables": variables},
+                timeout=self.timeout * 3
+            )
+            self.scheduler.update(response.status_code, response.headers)
+            if not is_rate_limited(response.status_code, response.headers):
+                break
+
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get("errors"):
+            messages = "; ".join(error.get("message", "") for error in payload["errors"])
+            raise requests.RequestException(f"GraphQL error: {messages}")
+        return payload["data"]
+
+    @cached()
+    def get_snapshot(self) -> Dict[str, Dict]:
+        """Fetch repositories with languages, README and commit count, keyed by name"""
+        snapshot = {}
+        cursor = None
+        while True:
+            data = self._post_graphql(REPOSITORIES_QUERY, {
+                "login": self.username,
+                "pageSize": self.page_size,
+                "cursor": cursor
+            })
+            repositories = (data.get("user") or {}).get("repositories") or {}
+            for node in repositories.get("nodes", []):
+                history = ((node.get("defaultBranchRef") or {}).get("target") or {}).get("history") or {}
+                snapshot[node["name"]] = {
+                    "repo": _to_rest_repo(node),
+                    "languages": {
+                        edge["node"]["name"]: edge["size"]
+                        for edge in (node.get("languages") or {}).get("edges", [])
+                    },
+                    "readme": _extract_readme(node),
+                    "commits": history.get("totalCount", 0),
+                }
+
+            page_info = repositories.get("pageInfo") or {}
+            if not page_info.get("hasNextPage"):
+                break
+            cursor = page_info.get("endCursor")
+        return snapshot
+
+    def _snapshot_entry(self, repo_name: str) -> Optional[Dict]:
+        """Snapshot entry for one repository, or None if the batch fetch failed"""
+        try:
+            return self.get_snapshot().get(repo_name)
+        except Exception as e:
+            print(f"Error fetching GraphQL snapshot: {e}")
+            return None
+
+    def fetch_repositories(self) -> List[Dict]:
+        """All public repositories, from the batch snapshot"""
+        return [entry["repo"] for entry in self.get_snapshot().values()]
+
+    def refresh_cache(self) -> List[Dict]:
+        """Re-fetch the batch snapshot and the REST-only resources ahead of expiry"""
+        GitHubGraphQLAPI.get_snapshot.refresh(self)
+        for refresh in (GitHubAPI.fetch_user_info.refresh, GitHubAPI.fetch_contribution_data.refresh):
+            try:
+                refresh(self)
+            except Exception as e:
+                print(f"⚠️ Background refresh failed: {e}")
+        return self.fetch_repositories()
+
+    def get_repo_languages(self, repo_name: str) -> Dict:
+        """Languages for one repository, falling back to REST if the batch failed"""
+        entry = self._snapshot_entry(repo_name)
+        if entry is None:
+            return super().get_repo_languages(repo_name)
+        return entry["languages"]
+
+    def get_readme_info(self, repo_name: str) -> Optional[Dict]:
+        """README content and blob SHA, from the batch snapshot"""
+        entry = self._snapshot_entry(repo_name)
+        if entry is None:
+            return super().get_readme_info(repo_name)
+        return entry["readme"]
+
+    @cached()
+    def get_repo_stats(self, repo_name: str) -> Dict:
+        """Commit count from the snapshot plus the REST contributor count"""
+        entry = self._snapshot_entry(repo_name)
+        if entry is None:
+            return super().get_repo_stats(repo_name)
+
+        try:
+            # GraphQL has no contributor count, so this one stays on REST
+            contributors = self._get_json(f"/repos/{self.username}/{repo_name}/contributors")
+            contributors_count = len(contributors or [])
+        except requests.RequestException:
+            contributors_count = 0
+
+        return {
+            "commits": entry["commits"],
+            "contributors": contributors_count
+        }
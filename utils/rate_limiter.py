@@ -0,0 +1,149 @@
+"""
+Rate-limit-aware request scheduler for the GitHub API
+"""
+import heapq
+import itertools
+import threading
+import time
+from typing import Mapping, Optional
+import requests
+
+# Lower values are served first
+PRIORITY_INTERACTIVE = 0   # Data a visitor is waiting for
+PRIORITY_BACKGROUND = 10   # Refreshes and index builds
+
+class RateLimitExceeded(requests.RequestException):
+    """Raised when a request cannot be scheduled within its wait budget"""
+
+def is_rate_limited(status_code: int, headers: Mapping) -> bool:
+    """Whether a response was rejected by a primary or secondary rate limit"""
+    if status_code == 429:
+        return True
+    return status_code == 403 and (
+        headers.get("Retry-After") is not None
+        or headers.get("X-RateLimit-Remaining") == "0"
+    )
+
+class RateLimitScheduler:
+    """Token budget fed by GitHub's rate-limit headers
+
+    Every request takes a token before it is sent. Callers queue in
+    priority order, and background callers leave `reserve_fraction` of the
+    budget untouched so interactive page data can still be fetched when
+    a refresh has used most of the hourly limit.
+    """
+
+    # GitHub asks clients to wait at least a minute after a secondary limit
+    SECONDARY_LIMIT_BACKOFF = 60
+
+    def __init__(self, reserve_fraction: float = 0.1):
+        self.reserve_fraction = reserve_fraction
+        self.limit = None        # Unknown until the first response
+        self.remaining = None
+        self.reset_at = 0.0
+        self.blocked_until = 0.0
+        self._waiting = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+
+    def acquire(self, priority: int = PRIORITY_INTERACTIVE, timeout: Optional[float] = None):
+        """Block until a request of the given priority may be sent"""
+        ticket = (priority, next(self._counter))
+        deadline = None if timeout is None else time.time() + timeout
+
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    now = time.time()
+                    wait = self._wait_time(ticket, now)
+                    if wait <= 0:
+                        break
+                    if deadline is not None:
+                        if now >= deadline:
+                            raise RateLimitExceeded(
+                                f"GitHub rate limit exhausted until {time.ctime(max(self.reset_at, self.blocked_until))}"
+                            )
+                        wait = min(wait, deadline - now)
+                    self._cond.wait(wait)
+            except BaseException:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+                raise
+
+            heapq.heappop(self._waiting)
+            if self.remaining is not None:
+                self.remaining -= 1
+            self._cond.notify_all()
+
+    def _wait_time(self, ticket, now: float) -> float:
+        """Seconds the ticket still has to wait, or 0 if it may go now"""
+        if self._waiting[0] != ticket:
+            return 1.0  # Re-checked whenever the queue head changes
+
+        if now < self.blocked_until:
+            return self.blocked_until - now
+
+        if self.remaining is None:
+            return 0
+
+        if self.reset_at and now >= self.reset_at:
+            # A new window has started; the next response will confirm the budget
+            self.remaining = self.limit
+            self.reset_at = 0.0
+            return 0
+
+        priority = ticket[0]
+        floor = 0 if priority <= PRIORITY_INTERACTIVE else int(self.limit * self.reserve_fraction)
+        if self.remaining > floor:
+            return 0
+        return max(self.reset_at - now, 1.0)
+
+    def update(self, status_code: int, headers: Mapping):
+        """Feed rate-limit headers from a response back into the budget"""
+        now = time.time()
+        with self._cond:
+            if headers.get("X-RateLimit-Remaining") is not None:
+                try:
+                    remaining = int(headers["X-RateLimit-Remaining"])
+                    limit = int(headers.get("X-RateLimit-Limit", remaining))
+                    reset_at = float(headers.get("X-RateLimit-Reset", 0))
+                except ValueError:
+                    remaining = None
+
+                if remaining is not None:
+                    if reset_at != self.reset_at or self.remaining is None:
+                        # New window: the server's count is authoritative
+                        self.remaining = remaining
+                    else:
+                        # Same window: other requests may still be in flight
+                        self.remaining = min(self.remaining, remaining)
+                    self.limit = limit
+                    self.reset_at = reset_at
+
+            if status_code == 304 and self.remaining is not None:
+                # Conditional hits don't count against the limit
+                self.remaining += 1
+
+            if is_rate_limited(status_code, headers):
+                retry_after = headers.get("Retry-After")
+                if retry_after is not None and retry_after.isdigit():
+                    self.blocked_until = now + int(retry_after)
+                elif self.remaining == 0 and self.reset_at:
+                    self.blocked_until = self.reset_at
+                else:
+                    self.blocked_until = now + self.SECONDARY_LIMIT_BACKOFF
+
+            self._cond.notify_all()
+
+    def status(self) -> dict:
+        """Snapshot of the current budget, for diagnostics"""
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "reset_at": self.reset_at,
+                "blocked_until": self.blocked_until,
+                "queued": len(self._waiting)
+            }
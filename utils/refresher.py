@@ -0,0 +1,104 @@
+"""
+Background refresher that keeps GitHub data warm off the request path
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+import config
+from utils.cache import get_cache
+from utils.github_api import create_github_api
+from utils.rate_limiter import PRIORITY_BACKGROUND
+
+class BackgroundRefresher:
+    """Re-fetches cached GitHub data on a timer, before it expires
+
+    Visitors keep reading the previous snapshot from the cache while a
+    refresh runs, so page renders never wait on GitHub. Callbacks receive
+    the repository list and the client, e.g. to refresh the knowledge base.
+
+    When several processes share a SQLite cache, only the one holding the
+    lease re-fetches from GitHub each interval. Every process still runs
+    its callbacks, reading repositories from the shared cache, so each
+    keeps its own in-memory indexes current.
+    """
+
+    LEASE_KEY = "refresher:last_run"
+
+    def __init__(self, github_api=None, interval: Optional[float] = None,
+                 callbacks: Optional[List[Callable]] = None):
+        self.github = github_api or create_github_api(priority=PRIORITY_BACKGROUND)
+        self.interval = interval or config.REFRESH_INTERVAL
+        self.callbacks = list(callbacks or [])
+        self.last_refresh = None
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, run_immediately: bool = False):
+        """Start the refresher thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(run_immediately,),
+            name="github-refresher",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Ask the refresher thread to exit after its current cycle"""
+        self._stop.set()
+
+    def _run(self, run_immediately: bool):
+        if not run_immediately and self._stop.wait(self.interval):
+            return
+        while not self._stop.is_set():
+            self.refresh_once()
+            if self._stop.wait(self.interval):
+                return
+
+    def _claim_lease(self) -> bool:
+        """Whether this process re-fetches from GitHub this cycle
+
+        The lease is claimed with a single conditional write, so only one
+        process per half interval gets it.
+        """
+        now = time.time()
+        return get_cache().add(self.LEASE_KEY, True, now, now + self.interval / 2)
+
+    def refresh_once(self, force: bool = False) -> bool:
+        """Run one refresh cycle; returns False if it failed
+
+        Without the lease, repositories come from the shared cache that
+        the lease holder keeps warm.
+        """
+        started = time.time()
+        try:
+            leased = force or self._claim_lease()
+            repos = self.github.refresh_cache() if leased else self.github.fetch_repositories()
+            for callback in self.callbacks:
+                try:
+                    callback(repos, self.github)
+                except Exception as e:
+                    print(f"⚠️ Refresh callback failed: {e}")
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"⚠️ Background GitHub refresh failed: {e}")
+            return False
+
+        self.last_refresh = time.time()
+        self.last_error = None
+        source = "GitHub" if leased else "the shared cache"
+        print(f"🔄 Refreshed {len(repos)} repositories from {source} in {self.last_refresh - started:.1f}s")
+        return True
+
+    def status(self) -> Dict:
+        """Snapshot of the refresher's state, for diagnostics"""
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "interval": self.interval,
+            "last_refresh": self.last_refresh,
+            "last_error": self.last_error
+        }